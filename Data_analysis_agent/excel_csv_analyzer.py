@@ -2,15 +2,21 @@ import streamlit as st
 import pandas as pd
 import os
 import tempfile
-from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
-from langchain.agents import AgentType
-from langchain_groq import ChatGroq
 from langchain.memory import ConversationBufferWindowMemory
 from langchain.schema import HumanMessage, AIMessage
 import hashlib
 import json
 import os
 
+from common.lazy_imports import lazy_from
+from common.groq_clients import get_chat_groq
+
+# langchain_experimental is only needed once a file has been uploaded
+create_pandas_dataframe_agent = lazy_from(
+    "langchain_experimental.agents.agent_toolkits", "create_pandas_dataframe_agent"
+)
+AgentType = lazy_from("langchain.agents", "AgentType")
+
 
 try:
     api_key = st.secrets["GROQ_API_KEY"]  # For Streamlit Cloud
@@ -164,9 +170,9 @@ with st.sidebar:
             )
 
             if True:  # Always true since API key is hardcoded
-                llm = ChatGroq(
+                llm = get_chat_groq(
+                    model_name,
                     api_key=api_key,
-                    model_name=model_name,
                     temperature=0.1  # Lower temperature for more consistent analysis
                 )
 
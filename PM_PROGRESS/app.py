@@ -1,7 +1,6 @@
 import re
 import streamlit as st
 import os
-import json
 import base64
 import pypandoc
 import tempfile
@@ -11,7 +10,9 @@ from docx.shared import Inches
 from io import BytesIO
 from PIL import Image
 from auth.auth_manager import register_user, login_user
-from utils.file_handler import create_project, load_user_projects
+from utils.file_handler import create_project, load_user_projects, render_logs_markdown
+from utils.store import save_log, get_log, list_log_dates
+from utils.asset_store import store_asset
 from lang_agent.proceed_l import generate_daily_log
 import datetime
 
@@ -444,24 +445,19 @@ else:
                         with st.spinner("🔄 Generating your daily log..."):
                             user_dir = os.path.join(USER_LOG_PATH, st.session_state.username)
                             os.makedirs(user_dir, exist_ok=True)
-                            md_file = os.path.join(user_dir, f"{st.session_state.username}_logs.md")
-                            json_file = os.path.join(user_dir, f"{st.session_state.username}_logs.json")
 
-                            img_paths = []
-                            if uploaded_images:
-                                img_dir = os.path.join(user_dir, "assets")
-                                os.makedirs(img_dir, exist_ok=True)
-                                for img in uploaded_images:
-                                    img_path = os.path.join(img_dir, img.name)
-                                    with open(img_path, "wb") as f:
-                                        f.write(img.read())
-                                    img_paths.append(img_path)
+                            current_date = datetime.datetime.now().strftime("%Y-%m-%d")
 
-                            img_md_lines = [f"![{os.path.basename(p)}](assets/{os.path.basename(p)})" for p in img_paths]
+                            img_paths = []
+                            img_md_lines = []
+                            for img in uploaded_images or []:
+                                img_path, rel_path = store_asset(
+                                    st.session_state.username, img.getvalue(), img.name, current_date
+                                )
+                                img_paths.append(img_path)
+                                img_md_lines.append(f"![{img.name}]({rel_path})")
                             img_md_block = "\n".join(img_md_lines)
 
-                            current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-
                             try:
                                 new_log = generate_daily_log(
                                     selected_project, selected_project_desc, user_input, 
@@ -470,19 +466,7 @@ else:
                             except:
                                 new_log = f"### 📊 {selected_project} - {current_date}\n\n**Today's Progress:**\n{user_input}"
 
-                            with open(md_file, "a") as f:
-                                f.write(f"\n\n{new_log}\n\n{img_md_block}")
-
-                            if os.path.exists(json_file):
-                                with open(json_file, "r") as f:
-                                    logs_dict = json.load(f)
-                            else:
-                                logs_dict = {}
-                            
-                            logs_dict[current_date] = f"{new_log}\n\n{img_md_block}"
-                            
-                            with open(json_file, "w") as f:
-                                json.dump(logs_dict, f, indent=2)
+                            save_log(st.session_state.username, current_date, f"{new_log}\n\n{img_md_block}")
 
                         st.success("🎉 Log saved successfully!")
                         st.markdown("### 📋 Generated Log Preview")
@@ -519,21 +503,17 @@ else:
 
         tabs = st.tabs(["📄 Complete Log History", "📅 Specific Date"])
         user_dir = os.path.join(USER_LOG_PATH, st.session_state.username)
-        md_file = os.path.join(user_dir, f"{st.session_state.username}_logs.md")
-        json_file = os.path.join(user_dir, f"{st.session_state.username}_logs.json")
+        full_content = render_logs_markdown(st.session_state.username)
 
         with tabs[0]:
             st.markdown("### 📖 Your Complete Work History")
             
             col1, col2 = st.columns([3, 1])
             with col2:
-                if os.path.exists(md_file):
+                if full_content:
                     if st.button("📥 Download Complete Report", key="download_all"):
                         with st.spinner("Generating Word document..."):
                             try:
-                                with open(md_file, "r") as f:
-                                    full_content = f.read()
-                                
                                 docx_filename = f"{st.session_state.username}_complete_logs.docx"
                                 docx_path = convert_md_to_docx(full_content, user_dir, docx_filename)
                                 
@@ -543,9 +523,8 @@ else:
                                 st.error(f"Error generating document: {str(e)}")
             
             with col1:
-                if os.path.exists(md_file):
-                    with open(md_file, "r") as f:
-                        logs = f.readlines()
+                if full_content:
+                    logs = full_content.split('\n')
                     
                     st.markdown('<div class="card">', unsafe_allow_html=True)
                     for line in logs:
@@ -572,13 +551,10 @@ else:
 
         with tabs[1]:
             st.markdown("### 📅 View Specific Date")
-            if os.path.exists(json_file):
-                with open(json_file, "r") as f:
-                    logs_dict = json.load(f)
-                
+            available_dates = list_log_dates(st.session_state.username)
+            if available_dates:
                 col1, col2 = st.columns([1, 2])
                 with col1:
-                    available_dates = list(logs_dict.keys())
                     st.info(f"📊 Available dates: {len(available_dates)}")
                     selected_date = st.date_input(
                         "🗓️ Select a date to view log:",
@@ -586,11 +562,11 @@ else:
                     )
                     
                     selected_date_str = selected_date.strftime("%Y-%m-%d")
-                    if selected_date_str in logs_dict:
+                    date_content = get_log(st.session_state.username, selected_date_str)
+                    if date_content is not None:
                         if st.button("📥 Download Date Report", key="download_date"):
                             with st.spinner("Generating Word document..."):
                                 try:
-                                    date_content = logs_dict[selected_date_str]
                                     docx_filename = f"{st.session_state.username}_{selected_date_str}_log.docx"
                                     docx_path = convert_md_to_docx(date_content, user_dir, docx_filename)
                                     
@@ -600,10 +576,10 @@ else:
                                     st.error(f"Error generating document: {str(e)}")
                 
                 with col2:
-                    if selected_date_str in logs_dict:
+                    if date_content is not None:
                         st.markdown(f"### 📋 Log for {selected_date_str}")
                         st.markdown('<div class="card">', unsafe_allow_html=True)
-                        log_lines = logs_dict[selected_date_str].split('\n')
+                        log_lines = date_content.split('\n')
                         for line in log_lines:
                             img_match = re.match(r'!\[(.*?)\]\((.*?)\)', line.strip())
                             if img_match:
@@ -1,19 +1,30 @@
 import os
 import re
-import json
+import sys
 from datetime import datetime, timedelta
 from typing import TypedDict, List, Optional, Dict, Any
 from dataclasses import dataclass
 import base64
 from pathlib import Path
 import hashlib
-import shutil
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
 
 from langgraph.graph import StateGraph, END
-from langchain_groq import ChatGroq
 from langchain.schema import HumanMessage, SystemMessage
 from langchain.prompts import ChatPromptTemplate
 
+from common.groq_clients import get_chat_groq
+
+# PM_PROGRESS on sys.path so utils/ imports when this file is run directly
+APP_DIR = str(Path(__file__).resolve().parents[1])
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
+
+from utils.store import save_log, recent_logs, get_image_analysis, save_image_analysis
+from utils.asset_store import store_asset
+
 try:
     api_key = st.secrets["GROQ_API_KEY"]  # For Streamlit Cloud
 except Exception:
@@ -23,6 +34,10 @@ except Exception:
 GROQ_API_KEY = api_key
 MODEL_NAME = "meta-llama/llama-4-scout-17b-16e-instruct"
 VISION_MODEL_NAME = "meta-llama/llama-4-scout-17b-16e-instruct"  
+MAX_VISION_WORKERS = 3
+# Longest side sent to the vision model; larger uploads are downscaled first
+VISION_MAX_SIDE = 1024
+VISION_JPEG_QUALITY = 80
 
 @dataclass
 class ProjectData:
@@ -31,7 +46,6 @@ class ProjectData:
     user_input: str
     images: List[str]  
     log_file_path: str
-    json_file_path: str
     username: str
     current_date: str  
 
@@ -45,15 +59,15 @@ class AgentState(TypedDict):
 
 class ProjectProgressAgent:
     def __init__(self, groq_api_key: str):
-        self.llm = ChatGroq(
-            groq_api_key=groq_api_key,
-            model_name=MODEL_NAME,
+        self.llm = get_chat_groq(
+            MODEL_NAME,
+            api_key=groq_api_key,
             temperature=0.3,
             max_tokens=2048
         )
-        self.vision_llm = ChatGroq(
-            groq_api_key=groq_api_key,
-            model_name=VISION_MODEL_NAME,
+        self.vision_llm = get_chat_groq(
+            VISION_MODEL_NAME,
+            api_key=groq_api_key,
             temperature=0.3,
             max_tokens=2048
         )
@@ -88,60 +102,71 @@ class ProjectProgressAgent:
         assets_dir = user_dir / "assets"
         assets_dir.mkdir(exist_ok=True)
         
-        json_file = user_dir / f"{username}_logs.json"
         md_file = user_dir / f"{username}_logs.md"
         
-        return str(json_file), str(md_file), str(assets_dir)
+        return str(md_file), str(assets_dir)
     
-    def _encode_image_to_base64(self, image_path: str) -> str:
+    def _read_image(self, image_path: str) -> tuple:
+        """(md5 hash, raw bytes) from a single read of the file"""
         try:
             with open(image_path, "rb") as image_file:
-                return base64.b64encode(image_file.read()).decode('utf-8')
+                data = image_file.read()
+            return hashlib.md5(data).hexdigest(), data
         except Exception as e:
-            print(f"Error encoding image {image_path}: {str(e)}")
-            return ""
+            print(f"Error reading image {image_path}: {str(e)}")
+            return "", b""
     
-    def _get_image_hash(self, image_path: str) -> str:
+    def _prepare_image_for_vision(self, image_data: bytes) -> tuple:
+        """(mime type, base64 payload) for the vision call.
+
+        Downscales to VISION_MAX_SIDE and re-encodes as JPEG, which drops
+        EXIF and other metadata. The original bytes are still what gets
+        hashed and stored; this only shrinks the upload. Falls back to the
+        original bytes if Pillow cannot decode the file.
+        """
         try:
-            with open(image_path, "rb") as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except:
-            return ""
+            with Image.open(BytesIO(image_data)) as image:
+                image = ImageOps.exif_transpose(image)
+                if image.mode in ("RGBA", "LA", "P"):
+                    # Flatten transparency onto white rather than black
+                    image = image.convert("RGBA")
+                    background = Image.new("RGB", image.size, (255, 255, 255))
+                    background.paste(image, mask=image.getchannel("A"))
+                    image = background
+                elif image.mode != "RGB":
+                    image = image.convert("RGB")
+                image.thumbnail((VISION_MAX_SIDE, VISION_MAX_SIDE), Image.LANCZOS)
+                
+                buffer = BytesIO()
+                image.save(buffer, format="JPEG", quality=VISION_JPEG_QUALITY, optimize=True)
+                return "image/jpeg", base64.b64encode(buffer.getvalue()).decode('utf-8')
+        except Exception as e:
+            print(f"Could not preprocess image, sending original: {str(e)}")
+            if image_data.startswith(b"\x89PNG"):
+                mime_type = "image/png"
+            elif image_data.startswith(b"GIF8"):
+                mime_type = "image/gif"
+            else:
+                mime_type = "image/jpeg"
+            return mime_type, base64.b64encode(image_data).decode('utf-8')
     
-    def _copy_image_to_assets(self, image_path: str, username: str, current_date: str) -> tuple:
+    def _copy_image_to_assets(self, image_path: str, image_data: bytes, image_hash: str,
+                              username: str, current_date: str) -> tuple:
         try:
-            _, _, assets_dir = self._create_directory_structure(username)
-            assets_path = Path(assets_dir)
-            
-            image_name = Path(image_path).name
-            clean_name = re.sub(r'[^\w\-_\.]', '_', image_name)
-            new_name = f"{current_date}_{clean_name}"
-            
-            dest_path = assets_path / new_name
-            shutil.copy2(image_path, dest_path)
-            
-            relative_path = f"./assets/{new_name}"
-            return str(dest_path), relative_path
+            abs_path, relative_path = store_asset(
+                username, image_data, Path(image_path).name, current_date, image_hash
+            )
+            return abs_path, f"./{relative_path}"
         except Exception as e:
             print(f"Error copying image: {str(e)}")
             return image_path, image_path
     
     def _load_previous_logs(self, state: AgentState) -> AgentState:
         try:
-            json_file_path = state["project_data"].json_file_path
-            
-            if not os.path.exists(json_file_path):
-                state["previous_logs"] = []
-                state["previous_images"] = []
-                return state
-            
-            with open(json_file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-            
             logs = []
             previous_images = []
             
-            for date_str, log_content in data.items():
+            for date_str, log_content in recent_logs(state["project_data"].username, limit=5):
                 image_pattern = r'!\[.*?\]\((.*?)\)'
                 images_in_log = re.findall(image_pattern, log_content)
                 previous_images.extend(images_in_log)
@@ -152,8 +177,7 @@ class ProjectProgressAgent:
                     'images': images_in_log
                 })
             
-            logs.sort(key=lambda x: x['date'], reverse=True)
-            state["previous_logs"] = logs[:5]
+            state["previous_logs"] = logs
             state["previous_images"] = list(set(previous_images)) 
 
             
@@ -167,67 +191,19 @@ class ProjectProgressAgent:
     def _analyze_images(self, state: AgentState) -> AgentState:
         try:
             project_data = state["project_data"]
-            image_analyses = []
             
             if not project_data.images:
                 state["image_analyses"] = []
                 return state
             
-            for image_path in project_data.images:
-                if not os.path.exists(image_path):
-                    continue
-                
-                image_hash = self._get_image_hash(image_path)
-                is_new_image = True  
-                
-                base64_image = self._encode_image_to_base64(image_path)
-                if not base64_image:
-                    continue
-                
-                analysis_prompt = f"""
-                Analyze this image in the context of the project: {project_data.name}
-                
-                Project Description: {project_data.description}
-                Today's Update: {project_data.user_input}
-                
-                Please provide:
-                1. What does this image show?
-                2. How does it relate to the project progress?
-                3. What technical details or insights can you extract?
-                4. Any issues, achievements, or notable elements visible?
-                
-                Keep the analysis concise but informative.
-                """
-                
-                messages = [
-                    SystemMessage(content="You are an expert at analyzing technical images and screenshots in the context of software development and project progress."),
-                    HumanMessage(content=[
-                        {"type": "text", "text": analysis_prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}"
-                            }
-                        }
-                    ])
-                ]
-                
-                response = self.vision_llm.invoke(messages)
-                
-                abs_path, relative_path = self._copy_image_to_assets(
-                    image_path, project_data.username, project_data.current_date
-                )
-                
-                image_analyses.append({
-                    'path': image_path,
-                    'absolute_path': abs_path,
-                    'relative_path': relative_path,
-                    'analysis': response.content,
-                    'is_new': is_new_image,
-                    'hash': image_hash
-                })
+            # Vision calls are network-bound; run them side by side, keep upload order
+            with ThreadPoolExecutor(max_workers=min(MAX_VISION_WORKERS, len(project_data.images))) as pool:
+                results = list(pool.map(
+                    lambda image_path: self._analyze_image(project_data, image_path),
+                    project_data.images
+                ))
             
-            state["image_analyses"] = image_analyses
+            state["image_analyses"] = [result for result in results if result]
             
         except Exception as e:
             state["error"] = f"Error analyzing images: {str(e)}"
@@ -235,6 +211,64 @@ class ProjectProgressAgent:
         
         return state
     
+    def _analyze_image(self, project_data: ProjectData, image_path: str) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(image_path):
+            return None
+        
+        image_hash, image_data = self._read_image(image_path)
+        if not image_data:
+            return None
+        
+        # Same screenshot already analysed for this project: no model call
+        analysis = get_image_analysis(image_hash, project_data.username, project_data.name)
+        is_new_image = analysis is None
+        
+        if is_new_image:
+            mime_type, base64_image = self._prepare_image_for_vision(image_data)
+            analysis_prompt = f"""
+            Analyze this image in the context of the project: {project_data.name}
+            
+            Project Description: {project_data.description}
+            Today's Update: {project_data.user_input}
+            
+            Please provide:
+            1. What does this image show?
+            2. How does it relate to the project progress?
+            3. What technical details or insights can you extract?
+            4. Any issues, achievements, or notable elements visible?
+            
+            Keep the analysis concise but informative.
+            """
+            
+            messages = [
+                SystemMessage(content="You are an expert at analyzing technical images and screenshots in the context of software development and project progress."),
+                HumanMessage(content=[
+                    {"type": "text", "text": analysis_prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime_type};base64,{base64_image}"
+                        }
+                    }
+                ])
+            ]
+            
+            analysis = self.vision_llm.invoke(messages).content
+            save_image_analysis(image_hash, project_data.username, project_data.name, analysis)
+        
+        abs_path, relative_path = self._copy_image_to_assets(
+            image_path, image_data, image_hash, project_data.username, project_data.current_date
+        )
+        
+        return {
+            'path': image_path,
+            'absolute_path': abs_path,
+            'relative_path': relative_path,
+            'analysis': analysis,
+            'is_new': is_new_image,
+            'hash': image_hash
+        }
+    
     def _analyze_progress(self, state: AgentState) -> AgentState:
         try:
             project_data = state["project_data"]
@@ -357,9 +391,7 @@ class ProjectProgressAgent:
                 current_log = state["current_log"]
                 current_date = project_data.current_date
                 
-                self._save_to_json(project_data.json_file_path, current_date, current_log)
-                
-                self._save_to_md(project_data.log_file_path, current_log)
+                save_log(project_data.username, current_date, current_log)
                 
                 # self._create_html_preview(project_data.log_file_path, current_log)
                 
@@ -370,42 +402,6 @@ class ProjectProgressAgent:
         
         return state
     
-    def _save_to_json(self, json_file_path: str, current_date: str, log_content: str):
-        try:
-            data = {}
-            if os.path.exists(json_file_path):
-                with open(json_file_path, 'r', encoding='utf-8') as file:
-                    try:
-                        data = json.load(file)
-                    except json.JSONDecodeError:
-                        data = {}
-            
-            data[current_date] = log_content
-            
-            with open(json_file_path, 'w', encoding='utf-8') as file:
-                json.dump(data, file, indent=2, ensure_ascii=False)
-                
-        except Exception as e:
-            raise Exception(f"Error saving to JSON: {str(e)}")
-    
-    def _save_to_md(self, md_file_path: str, log_content: str):
-        """Save log to MD file (append to existing content)"""
-        try:
-            existing_content = ""
-            if os.path.exists(md_file_path):
-                with open(md_file_path, 'r', encoding='utf-8') as file:
-                    existing_content = file.read()
-            
-            separator = "\n\n---\n\n" if existing_content.strip() else ""
-            
-            new_content = f"{log_content}{separator}{existing_content}"
-            
-            with open(md_file_path, 'w', encoding='utf-8') as file:
-                file.write(new_content)
-                
-        except Exception as e:
-            raise Exception(f"Error saving to MD: {str(e)}")
-    
     def _create_html_preview(self, log_file_path: str, content: str):
         try:
             html_path = log_file_path.replace('.md', '_preview.html')
@@ -573,7 +569,7 @@ Structure:
         
         valid_images = [img for img in images if os.path.exists(img)][:3]
         
-        json_file_path, md_file_path, _ = self._create_directory_structure(username)
+        md_file_path, _ = self._create_directory_structure(username)
         
         project_data = ProjectData(
             name=project_name,
@@ -581,7 +577,6 @@ Structure:
             user_input=user_input,
             images=valid_images,
             log_file_path=md_file_path,
-            json_file_path=json_file_path,
             username=username,
             current_date=current_date
         )
@@ -603,8 +598,6 @@ Structure:
             "current_log": result.get("current_log"),
             "previous_logs_count": len(result.get("previous_logs", [])),
             "images_analyzed": len(result.get("image_analyses", [])),
-            "json_file_path": json_file_path,
-            "md_file_path": md_file_path,
             "date": current_date
         }
 
@@ -637,8 +630,6 @@ def generate_daily_log(project_name, project_description, user_input, username,
     
     if result["success"]:
         print("✅ Log entry created successfully!")
-        print(f"📁 JSON file: {result['json_file_path']}")
-        print(f"📁 MD file: {result['md_file_path']}")
         print(f"📅 Date: {result['date']}")
         print(f"📊 Previous logs found: {result['previous_logs_count']}")
         print(f"🖼️ Images analyzed: {result['images_analyzed']}")
@@ -0,0 +1,38 @@
+# utils/asset_store.py
+import os
+import hashlib
+import tempfile
+
+from utils.store import add_asset_ref
+
+LOG_DIR = "data/log"
+
+
+def asset_name(image_hash, original_name):
+    """Blob file name: content hash plus the original extension"""
+    ext = os.path.splitext(original_name)[1].lower() or ".bin"
+    return f"{image_hash}{ext}"
+
+
+def store_asset(username, data, original_name, log_date, image_hash=None):
+    """Save an uploaded image once per distinct content and record the reference.
+
+    Files are named by their md5, so the same image uploaded again (or by
+    the agent after the app already stored it) is not written a second
+    time. Returns (absolute path, path relative to the user's log dir).
+    """
+    image_hash = image_hash or hashlib.md5(data).hexdigest()
+    assets_dir = os.path.join(LOG_DIR, username, "assets")
+    os.makedirs(assets_dir, exist_ok=True)
+
+    name = asset_name(image_hash, original_name)
+    path = os.path.join(assets_dir, name)
+    if not os.path.exists(path):
+        # Write then rename, so a concurrent reader never sees half a file
+        fd, tmp_path = tempfile.mkstemp(dir=assets_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    add_asset_ref(image_hash, username, log_date, original_name, name)
+    return os.path.abspath(path), f"assets/{name}"
@@ -1,39 +1,20 @@
 # utils/file_handler.py
-import os
-import json
-from datetime import datetime
+from utils.store import add_project, list_projects, iter_logs
 
-DATA_DIR = "data/projects"
 
+def create_project(username, project_name, description):
+    """False if the user already has a project with this name"""
+    return add_project(username, project_name, description)
 
-def ensure_user_dir(username):
-    user_path = os.path.join(DATA_DIR, username)
-    os.makedirs(user_path, exist_ok=True)
-    return user_path
 
+def load_user_projects(username):
+    return list_projects(username)
 
-def create_project(username, project_name, description):
-    user_path = ensure_user_dir(username)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    project_id = f"project_{timestamp}.json"
-    project_data = {
-        "project_id": project_id,
-        "project_name": project_name,
-        "description": description,
-        "created_on": datetime.now().strftime("%Y-%m-%d"),
-        "logs": []
-    }
-    with open(os.path.join(user_path, project_id), "w") as f:
-        json.dump(project_data, f, indent=4)
 
+def render_logs_markdown(username):
+    """Complete log history as markdown, newest entry first.
 
-def load_user_projects(username):
-    user_path = os.path.join(DATA_DIR, username)
-    if not os.path.exists(user_path):
-        return []
-    projects = []
-    for file in os.listdir(user_path):
-        if file.endswith(".json"):
-            with open(os.path.join(user_path, file), "r") as f:
-                projects.append(json.load(f))
-    return sorted(projects, key=lambda x: x["created_on"], reverse=True)
+    Built from the store on demand, so saving a day never rewrites a
+    growing markdown file.
+    """
+    return "\n\n---\n\n".join(content for _, content in iter_logs(username))
@@ -0,0 +1,325 @@
+# utils/store.py
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+DB_PATH = os.getenv("PM_PROGRESS_DB", "data/pm_progress.db")
+
+# Saves between WAL truncations; SQLite's auto-checkpoint never shrinks the file
+COMPACT_EVERY = 200
+
+# Stored in PRAGMA user_version once the schema and the JSON import commit
+SCHEMA_VERSION = 1
+
+# Legacy JSON locations, imported once, in the same transaction as the schema
+USERS_JSON = "auth/users.json"
+PROJECTS_DIR = "data/projects"
+LOG_DIR = "data/log"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    password TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    created_on TEXT NOT NULL,
+    UNIQUE (username, project_name)
+);
+CREATE INDEX IF NOT EXISTS projects_by_user ON projects (username, created_on);
+CREATE TABLE IF NOT EXISTS logs (
+    username TEXT NOT NULL,
+    log_date TEXT NOT NULL,
+    content TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (username, log_date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS image_analyses (
+    image_hash TEXT NOT NULL,
+    username TEXT NOT NULL,
+    project_name TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (image_hash, username, project_name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS asset_refs (
+    image_hash TEXT NOT NULL,
+    username TEXT NOT NULL,
+    log_date TEXT NOT NULL,
+    original_name TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    PRIMARY KEY (username, image_hash, log_date)
+) WITHOUT ROWID;
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+_saves = 0
+
+
+def get_connection():
+    """Per-thread connection; WAL lets readers run alongside the single writer"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        _init_db()
+        conn = sqlite3.connect(DB_PATH, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 10000")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        _local.conn = conn
+    return conn
+
+
+def _init_db():
+    """Create the schema and import the legacy JSON files, all or nothing.
+
+    Completion is recorded in user_version inside the same transaction, so a
+    failed import leaves nothing behind and is simply retried on next start.
+    """
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=10, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have finished while this one waited for the lock
+                if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    # executescript would commit first, so run statements one by one
+                    for statement in SCHEMA.split(";"):
+                        if statement.strip():
+                            conn.execute(statement)
+                    migrate_from_json(conn)
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        _initialized = True
+
+
+def migrate_from_json(conn, users_file=USERS_JSON, projects_dir=PROJECTS_DIR, log_dir=LOG_DIR):
+    """Import users.json, per-project JSON files and <user>_logs.json files.
+
+    Existing rows are left alone, so running it again is harmless. Malformed
+    entries are skipped with a warning rather than failing the whole import.
+    """
+    now = datetime.now().isoformat(timespec="seconds")
+
+    if os.path.exists(users_file):
+        with open(users_file, "r") as f:
+            try:
+                users = json.load(f)
+            except json.JSONDecodeError as e:
+                print(f"Skipping {users_file}: {e}")
+                users = {}
+        for name, user in users.items():
+            try:
+                row = (name, user["email"], user["password"], now)
+            except (KeyError, TypeError):
+                print(f"Skipping user {name!r} in {users_file}: missing email or password")
+                continue
+            conn.execute("INSERT OR IGNORE INTO users VALUES (?, ?, ?, ?)", row)
+
+    if os.path.isdir(projects_dir):
+        for username in os.listdir(projects_dir):
+            user_path = os.path.join(projects_dir, username)
+            if not os.path.isdir(user_path):
+                continue
+            for file in os.listdir(user_path):
+                if not file.endswith(".json"):
+                    continue
+                project_file = os.path.join(user_path, file)
+                with open(project_file, "r") as f:
+                    try:
+                        project = json.load(f)
+                    except json.JSONDecodeError as e:
+                        print(f"Skipping {project_file}: {e}")
+                        continue
+                if not isinstance(project, dict) or "project_name" not in project:
+                    print(f"Skipping {project_file}: no project_name")
+                    continue
+                conn.execute(
+                    "INSERT OR IGNORE INTO projects (username, project_id, project_name, description, created_on) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (username, project.get("project_id", file), project["project_name"],
+                     project.get("description", ""), project.get("created_on", now[:10])),
+                )
+
+    if os.path.isdir(log_dir):
+        for username in os.listdir(log_dir):
+            logs_file = os.path.join(log_dir, username, f"{username}_logs.json")
+            if not os.path.exists(logs_file):
+                continue
+            with open(logs_file, "r", encoding="utf-8") as f:
+                try:
+                    logs = json.load(f)
+                except json.JSONDecodeError as e:
+                    print(f"Skipping {logs_file}: {e}")
+                    continue
+            conn.executemany(
+                "INSERT OR IGNORE INTO logs VALUES (?, ?, ?, ?)",
+                [(username, log_date, content, now) for log_date, content in logs.items()],
+            )
+
+
+# Users
+
+def get_user(username):
+    row = get_connection().execute(
+        "SELECT username, email, password FROM users WHERE username = ?", (username,)
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def add_user(username, email, password_hash):
+    """False if the username is taken"""
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO users VALUES (?, ?, ?, ?)",
+                (username, email, password_hash, datetime.now().isoformat(timespec="seconds")),
+            )
+    except sqlite3.IntegrityError:
+        return False
+    return True
+
+
+# Projects
+
+def add_project(username, project_name, description):
+    """False if the user already has a project with this name"""
+    now = datetime.now()
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO projects (username, project_id, project_name, description, created_on) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (username, f"project_{now.strftime('%Y%m%d_%H%M%S')}", project_name,
+                 description, now.strftime("%Y-%m-%d")),
+            )
+    except sqlite3.IntegrityError:
+        return False
+    return True
+
+
+def list_projects(username):
+    rows = get_connection().execute(
+        "SELECT project_id, project_name, description, created_on FROM projects "
+        "WHERE username = ? ORDER BY created_on DESC, id DESC",
+        (username,),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+# Daily logs, one entry per user per date
+
+def save_log(username, log_date, content):
+    """Insert or replace the entry for this date.
+
+    Cost is one keyed write into the WAL regardless of how much history the
+    user has; the WAL is folded back and truncated every COMPACT_EVERY saves.
+    """
+    global _saves
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?)",
+            (username, log_date, content, datetime.now().isoformat(timespec="seconds")),
+        )
+    _saves += 1
+    if _saves % COMPACT_EVERY == 0:
+        compact()
+
+
+def compact():
+    """Checkpoint the WAL into the database file and truncate it"""
+    get_connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def get_log(username, log_date):
+    row = get_connection().execute(
+        "SELECT content FROM logs WHERE username = ? AND log_date = ?", (username, log_date)
+    ).fetchone()
+    return row["content"] if row else None
+
+
+def list_log_dates(username):
+    rows = get_connection().execute(
+        "SELECT log_date FROM logs WHERE username = ? ORDER BY log_date DESC", (username,)
+    ).fetchall()
+    return [row["log_date"] for row in rows]
+
+
+def recent_logs(username, limit=5):
+    """Newest first, as (date, content) tuples"""
+    rows = get_connection().execute(
+        "SELECT log_date, content FROM logs WHERE username = ? ORDER BY log_date DESC LIMIT ?",
+        (username, limit),
+    ).fetchall()
+    return [(row["log_date"], row["content"]) for row in rows]
+
+
+def iter_logs(username):
+    """All entries newest first, streamed from the (username, log_date) key"""
+    cursor = get_connection().execute(
+        "SELECT log_date, content FROM logs WHERE username = ? ORDER BY log_date DESC", (username,)
+    )
+    for row in cursor:
+        yield row["log_date"], row["content"]
+
+
+# Vision analyses, keyed by image content so re-uploads skip the model
+
+def get_image_analysis(image_hash, username, project_name):
+    row = get_connection().execute(
+        "SELECT analysis FROM image_analyses WHERE image_hash = ? AND username = ? AND project_name = ?",
+        (image_hash, username, project_name),
+    ).fetchone()
+    return row["analysis"] if row else None
+
+
+def save_image_analysis(image_hash, username, project_name, analysis):
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO image_analyses VALUES (?, ?, ?, ?, ?)",
+            (image_hash, username, project_name, analysis, datetime.now().isoformat(timespec="seconds")),
+        )
+
+
+# Content-addressed assets: one file per distinct image, one row per use
+
+def add_asset_ref(image_hash, username, log_date, original_name, file_name):
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO asset_refs VALUES (?, ?, ?, ?, ?)",
+            (image_hash, username, log_date, original_name, file_name),
+        )
+
+
+def asset_refs(username, image_hash):
+    """Dates and original names under which this image was uploaded"""
+    rows = get_connection().execute(
+        "SELECT log_date, original_name, file_name FROM asset_refs "
+        "WHERE username = ? AND image_hash = ? ORDER BY log_date",
+        (username, image_hash),
+    ).fetchall()
+    return [dict(row) for row in rows]
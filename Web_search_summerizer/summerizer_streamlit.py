@@ -17,17 +17,21 @@ try:
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
-from langchain_community.vectorstores import FAISS
-from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_groq import ChatGroq
 from langchain.schema import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langgraph.graph import StateGraph, END
 import operator
 import json
 from datetime import datetime
 import os
 
+from common.lazy_imports import lazy_from
+from common.groq_clients import get_chat_groq
+
+# Vector store and embedding stacks load when the first agent is built
+FAISS = lazy_from("langchain_community.vectorstores", "FAISS")
+HuggingFaceEmbeddings = lazy_from("langchain_community.embeddings", "HuggingFaceEmbeddings")
+RecursiveCharacterTextSplitter = lazy_from("langchain.text_splitter", "RecursiveCharacterTextSplitter")
+
 api_key = os.getenv("GROQ_API_KEY")
 
 # Configure Streamlit page
@@ -157,9 +161,9 @@ class AgentState(TypedDict):
 class WebSearchReactAgent:
     def __init__(self, groq_api_key: str):
         self.groq_api_key = groq_api_key
-        self.llm = ChatGroq(
-            groq_api_key=groq_api_key,
-            model_name="llama-3.3-70b-versatile",
+        self.llm = get_chat_groq(
+            "llama-3.3-70b-versatile",
+            api_key=groq_api_key,
             temperature=0.1
         )
         
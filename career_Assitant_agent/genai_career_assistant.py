@@ -1,7 +1,6 @@
 from typing import Dict, TypedDict
 from langgraph.graph import StateGraph, END, START
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_groq import ChatGroq
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, trim_messages
 from langchain_community.tools import DuckDuckGoSearchResults
 from langchain.agents import create_tool_calling_agent, AgentExecutor
@@ -9,6 +8,9 @@ from dotenv import load_dotenv
 import os
 from datetime import datetime
 
+from common.groq_clients import get_chat_groq
+from common.llm_cache import cached_invoke
+
 # Load environment variables from a .env file
 load_dotenv()
 
@@ -16,7 +18,9 @@ load_dotenv()
 os.environ["GROQ_API_KEY"] = os.getenv('GROQ_API_KEY')
 
 # Instantiate a chat model using Groq's LLaMA model
-llm = ChatGroq(model="llama-3.3-70b-versatile", verbose=True, temperature=0.5)
+llm = get_chat_groq("llama-3.3-70b-versatile", verbose=True, temperature=0.5)
+# Deterministic client for categorize, whose answers are cached
+classifier_llm = get_chat_groq("llama-3.3-70b-versatile", temperature=0)
 
 # Define the State class for workflow state management
 class State(TypedDict):
@@ -60,7 +64,7 @@ def show_md_file(file_path):
 class LearningResourceAgent:
     def __init__(self, prompt):
         # Note: Using ChatGroq instead of ChatGoogleGenerativeAI for consistency
-        self.model = ChatGroq(model="llama-3.3-70b-versatile")
+        self.model = get_chat_groq("llama-3.3-70b-versatile")
         self.prompt = prompt
         self.tools = [DuckDuckGoSearchResults()]
 
@@ -97,7 +101,7 @@ class LearningResourceAgent:
 # Interview Agent
 class InterviewAgent:
     def __init__(self, prompt):
-        self.model = ChatGroq(model="llama-3.3-70b-versatile")
+        self.model = get_chat_groq("llama-3.3-70b-versatile")
         self.prompt = prompt
         self.tools = [DuckDuckGoSearchResults()]
 
@@ -145,7 +149,7 @@ class InterviewAgent:
 # Resume Maker
 class ResumeMaker:
     def __init__(self, prompt):
-        self.model = ChatGroq(model="llama-3.3-70b-versatile")
+        self.model = get_chat_groq("llama-3.3-70b-versatile")
         self.prompt = prompt
         self.tools = [DuckDuckGoSearchResults()]
         self.agent = create_tool_calling_agent(self.model, self.tools, self.prompt)
@@ -170,7 +174,7 @@ class ResumeMaker:
 # Job Search
 class JobSearch:
     def __init__(self, prompt):
-        self.model = ChatGroq(model="llama-3.3-70b-versatile")
+        self.model = get_chat_groq("llama-3.3-70b-versatile")
         self.prompt = prompt
         self.tools = DuckDuckGoSearchResults()
 
@@ -199,9 +203,9 @@ def categorize(state: State) -> State:
         "Now, categorize the following customer query:\n"
         "Query: {query}"
     )
-    chain = prompt | llm
     print('Categorizing the customer query...')
-    category = chain.invoke({"query": state["query"]}).content
+    # Repeat queries are common here, so the classification is served from the LLM cache
+    category = cached_invoke(classifier_llm, prompt.invoke({"query": state["query"]})).content
     return {"category": category}
 
 def handle_learning_resource(state: State) -> State:
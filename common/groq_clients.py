@@ -0,0 +1,93 @@
+# common/groq_clients.py
+"""Process-wide Groq clients shared by every agent.
+
+All clients ride on one keep-alive HTTP connection pool, so an LLM call
+reuses an open TLS connection instead of building a client and doing a
+handshake each time. Clients are cached per model and settings; the
+registry is safe to use from Streamlit's script threads.
+"""
+import threading
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+HTTP_LIMITS = httpx.Limits(
+    max_connections=50,
+    max_keepalive_connections=20,
+    keepalive_expiry=120,
+)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+_lock = threading.Lock()
+_registry = {}
+
+
+def _get_or_create(key, factory):
+    client = _registry.get(key)
+    if client is None:
+        with _lock:
+            client = _registry.get(key)
+            if client is None:
+                client = factory()
+                _registry[key] = client
+    return client
+
+
+def _settings_key(settings):
+    return tuple(sorted(settings.items()))
+
+
+def get_http_client():
+    """Shared httpx.Client with keep-alive pooling"""
+    return _get_or_create(
+        ("httpx",),
+        lambda: httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+    )
+
+
+def get_requests_session():
+    """Shared requests.Session for code that talks to the REST API directly"""
+    def factory():
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    return _get_or_create(("requests",), factory)
+
+
+def get_groq_client(api_key=None, **settings):
+    """Shared groq.Groq SDK client (api_key=None reads GROQ_API_KEY)"""
+    from groq import Groq
+
+    return _get_or_create(
+        ("groq", api_key, _settings_key(settings)),
+        lambda: Groq(api_key=api_key, http_client=get_http_client(), **settings),
+    )
+
+
+def get_chat_groq(model, api_key=None, **settings):
+    """Shared LangChain ChatGroq for a model and its settings"""
+    from langchain_groq import ChatGroq
+
+    def factory():
+        kwargs = dict(settings)
+        if api_key:
+            kwargs["api_key"] = api_key
+        return ChatGroq(model=model, http_client=get_http_client(), **kwargs)
+
+    return _get_or_create(("chat_groq", model, api_key, _settings_key(settings)), factory)
+
+
+def close_all():
+    """Close pooled connections (mainly for scripts and tests)"""
+    with _lock:
+        for client in _registry.values():
+            close = getattr(client, "close", None)
+            if close:
+                close()
+        _registry.clear()
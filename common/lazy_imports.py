@@ -0,0 +1,76 @@
+# common/lazy_imports.py
+"""Deferred imports for heavy agent dependencies.
+
+    px = lazy_import("plotly.express")
+    FAISS = lazy_from("langchain_community.vectorstores", "FAISS")
+
+The real import happens on first attribute access or call, so importing an
+agent module only pays for what the user actually touches.
+"""
+import time
+import importlib
+import threading
+
+# Seconds spent resolving each deferred import, for startup benchmarks
+LOAD_TIMES = {}
+_lock = threading.Lock()
+
+
+class _LazyProxy:
+    __slots__ = ("_lazy_name", "_lazy_attr", "_lazy_target")
+
+    def __init__(self, module_name, attr=None):
+        object.__setattr__(self, "_lazy_name", module_name)
+        object.__setattr__(self, "_lazy_attr", attr)
+        object.__setattr__(self, "_lazy_target", None)
+
+    def _lazy_resolve(self):
+        target = object.__getattribute__(self, "_lazy_target")
+        if target is not None:
+            return target
+
+        with _lock:
+            target = object.__getattribute__(self, "_lazy_target")
+            if target is None:
+                module_name = object.__getattribute__(self, "_lazy_name")
+                attr = object.__getattribute__(self, "_lazy_attr")
+                start = time.perf_counter()
+                target = importlib.import_module(module_name)
+                if attr is not None:
+                    target = getattr(target, attr)
+                label = f"{module_name}.{attr}" if attr else module_name
+                LOAD_TIMES[label] = time.perf_counter() - start
+                object.__setattr__(self, "_lazy_target", target)
+        return target
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._lazy_resolve(), name, value)
+
+    def __call__(self, *args, **kwargs):
+        return self._lazy_resolve()(*args, **kwargs)
+
+    def __dir__(self):
+        return dir(self._lazy_resolve())
+
+    def __repr__(self):
+        name = object.__getattribute__(self, "_lazy_name")
+        attr = object.__getattribute__(self, "_lazy_attr")
+        state = "loaded" if object.__getattribute__(self, "_lazy_target") is not None else "deferred"
+        return f"<lazy {name}{'.' + attr if attr else ''} ({state})>"
+
+
+def lazy_import(module_name):
+    """Stand-in for `import module_name` that imports on first use"""
+    return _LazyProxy(module_name)
+
+
+def lazy_from(module_name, attr):
+    """Stand-in for `from module_name import attr` that imports on first use"""
+    return _LazyProxy(module_name, attr)
+
+
+def is_loaded(proxy):
+    return object.__getattribute__(proxy, "_lazy_target") is not None
@@ -0,0 +1,168 @@
+# common/llm_cache.py
+"""Disk-backed cache for LLM responses.
+
+Entries are keyed on model, messages, temperature and max_tokens. Each
+entry expires after a TTL, and the least recently used entries are evicted
+once the cache grows past `max_entries`. Caching is opt-in per call site,
+and only makes sense for deterministic (temperature 0) prompts such as
+classification or scoring:
+
+    result = cached_invoke(llm, prompt)
+
+Pass `validate` when the caller parses the response: it is called with the
+response text before anything is stored, and if it raises, the exception
+propagates and the response is not cached, so a malformed reply is retried
+on the next call instead of being served until the TTL expires.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", str(ROOT_DIR / ".cache" / "llm_cache.sqlite3"))
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class LLMCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)"
+            )
+
+    @staticmethod
+    def make_key(model, messages, temperature=None, max_tokens=None):
+        payload = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, model, response):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def stats(self):
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": entries,
+        }
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+        self.hits = self.misses = 0
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Process-wide cache at DEFAULT_CACHE_PATH"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = LLMCache()
+    return _default_cache
+
+
+def _message_dicts(prompt):
+    """Normalize a LangChain prompt (str, prompt value or message list) for keying"""
+    if isinstance(prompt, str):
+        return [{"role": "human", "content": prompt}]
+    if hasattr(prompt, "to_messages"):
+        prompt = prompt.to_messages()
+    return [{"role": message.type, "content": message.content} for message in prompt]
+
+
+def cached_invoke(llm, prompt, cache=None, validate=None):
+    """llm.invoke(prompt) through the cache; returns an AIMessage either way"""
+    from langchain_core.messages import AIMessage
+
+    cache = cache or get_llm_cache()
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    key = cache.make_key(
+        model,
+        _message_dicts(prompt),
+        getattr(llm, "temperature", None),
+        getattr(llm, "max_tokens", None),
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        return AIMessage(content=cached)
+
+    result = llm.invoke(prompt)
+    if validate is not None:
+        validate(result.content)
+    cache.set(key, model, result.content)
+    return result
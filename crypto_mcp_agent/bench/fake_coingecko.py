@@ -0,0 +1,168 @@
+"""Local stand-in for the CoinGecko API, for benchmarking the MCP server.
+
+    python crypto_mcp_agent/bench/fake_coingecko.py --port 8765 --latency-ms 80 --error-rate 0.02
+    COINGECKO_BASE_URL=http://127.0.0.1:8765/api/v3 mcp run crypto_mcp_agent/server/crypto_currency.py
+
+Replays /coins/markets responses from fixtures/coins_markets_<currency>.json
+and synthesizes /coins/{id}/market_chart daily series around the fixture
+prices, with configurable latency and injected 429/500 errors. Refresh the fixtures
+from the real API with:
+
+    python crypto_mcp_agent/bench/fake_coingecko.py record
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+REAL_BASE_URL = "https://api.coingecko.com/api/v3"
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR):
+    """currency -> list of market records"""
+    fixtures = {}
+    for path in Path(fixtures_dir).glob("coins_markets_*.json"):
+        currency = path.stem.rsplit("_", 1)[-1]
+        fixtures[currency] = json.loads(path.read_text(encoding="utf-8"))
+    if "usd" not in fixtures:
+        raise FileNotFoundError(f"No coins_markets_usd.json in {fixtures_dir}")
+    return fixtures
+
+
+def create_app(fixtures, latency_ms=50.0, jitter_ms=20.0, error_rate=0.0, rate_limit_rate=0.0):
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    stats = {"requests": 0, "injected_429": 0, "injected_500": 0}
+
+    async def simulate_network():
+        delay = max(0.0, random.gauss(latency_ms, jitter_ms)) / 1000
+        await asyncio.sleep(delay)
+
+    def injected_error():
+        roll = random.random()
+        if roll < rate_limit_rate:
+            stats["injected_429"] += 1
+            return JSONResponse(
+                {"status": {"error_code": 429, "error_message": "rate limited (injected)"}},
+                status_code=429, headers={"Retry-After": "1"},
+            )
+        if roll < rate_limit_rate + error_rate:
+            stats["injected_500"] += 1
+            return JSONResponse({"error": "internal error (injected)"}, status_code=500)
+        return None
+
+    async def coins_markets(request):
+        stats["requests"] += 1
+        await simulate_network()
+        error = injected_error()
+        if error:
+            return error
+
+        params = request.query_params
+        records = fixtures.get(params.get("vs_currency", "usd").lower(), fixtures["usd"])
+        ids = params.get("ids")
+        if ids:
+            wanted = {coin.strip() for coin in ids.split(",")}
+            records = [record for record in records if record["id"] in wanted]
+        per_page = int(params.get("per_page", 100))
+        page = int(params.get("page", 1))
+        start = (page - 1) * per_page
+        return JSONResponse(records[start:start + per_page])
+
+    async def market_chart(request):
+        stats["requests"] += 1
+        await simulate_network()
+        error = injected_error()
+        if error:
+            return error
+
+        params = request.query_params
+        coin_id = request.path_params["coin_id"]
+        records = fixtures.get(params.get("vs_currency", "usd").lower(), fixtures["usd"])
+        record = next((record for record in records if record["id"] == coin_id), None)
+        if record is None:
+            return JSONResponse({"error": "coin not found"}, status_code=404)
+
+        # Daily points at 00:00 UTC plus the current price, like the real API.
+        # A random walk seeded per coin and day keeps every day stable across calls.
+        now = time.time()
+        days = int(params.get("days", 1))
+        midnight = int(now // 86400) * 86400
+        timestamps = [midnight - offset * 86400 for offset in range(days, -1, -1)] + [int(now)]
+        prices, caps, volumes = [], [], []
+        for ts in timestamps:
+            drift = random.Random(f"{coin_id}:{ts // 86400}").uniform(0.85, 1.15)
+            price = record["current_price"] * drift
+            prices.append([ts * 1000, price])
+            caps.append([ts * 1000, record["market_cap"] * drift])
+            volumes.append([ts * 1000, record["total_volume"] * drift])
+        return JSONResponse({"prices": prices, "market_caps": caps, "total_volumes": volumes})
+
+    async def ping(request):
+        return JSONResponse({"gecko_says": "(V3) To the Moon!"})
+
+    async def fake_stats(request):
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/api/v3/ping", ping),
+        Route("/api/v3/coins/markets", coins_markets),
+        Route("/api/v3/coins/{coin_id}/market_chart", market_chart),
+        Route("/_stats", fake_stats),
+    ])
+
+
+def record_fixtures(currencies, per_page=100):
+    """Save live /coins/markets responses as fixtures"""
+    import httpx
+
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    for currency in currencies:
+        response = httpx.get(
+            f"{REAL_BASE_URL}/coins/markets",
+            params={"vs_currency": currency, "order": "market_cap_desc",
+                    "per_page": per_page, "page": 1, "sparkline": "false"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        path = FIXTURES_DIR / f"coins_markets_{currency}.json"
+        path.write_text(json.dumps(response.json(), indent=2), encoding="utf-8")
+        print(f"Recorded {len(response.json())} coins to {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake CoinGecko API server")
+    sub = parser.add_subparsers(dest="command")
+    record = sub.add_parser("record", help="Record fixtures from the real API")
+    record.add_argument("--currencies", default="usd")
+    record.add_argument("--per-page", type=int, default=100)
+
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR))
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean response latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Latency standard deviation")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429 responses")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record_fixtures(args.currencies.split(","), args.per_page)
+        return
+
+    import uvicorn
+
+    app = create_app(
+        load_fixtures(args.fixtures), args.latency_ms, args.jitter_ms,
+        args.error_rate, args.rate_limit_rate,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Concurrent load generator for the crypto MCP server.
+
+Starts the server over stdio (pointed at COINGECKO_BASE_URL), fires tool
+calls with a fixed concurrency and reports latency percentiles and
+throughput.
+
+    python crypto_mcp_agent/bench/fake_coingecko.py &
+    python crypto_mcp_agent/bench/load_test.py --requests 500 --concurrency 50
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+SERVER_PATH = Path(__file__).resolve().parent.parent / "server" / "crypto_currency.py"
+ERROR_PREFIXES = ("Error", "HTTP error", "Network error", "Unexpected error")
+
+# Overlapping portfolios, the pattern agents produce in practice
+DEFAULT_ID_SETS = [
+    "bitcoin",
+    "bitcoin,ethereum",
+    "ethereum,solana",
+    "solana,cardano,dogecoin",
+    "ripple,tron,binancecoin",
+    "bitcoin,ethereum,solana,cardano",
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def build_calls(args):
+    """List of (tool name, arguments) to issue"""
+    if args.tool:
+        arguments = json.loads(args.arguments) if args.arguments else {}
+        return [(args.tool, arguments)] * args.requests
+    return [
+        ("get_crypto_market_info", {"crypto_ids": random.choice(DEFAULT_ID_SETS), "output_format": args.output_format})
+        for _ in range(args.requests)
+    ]
+
+
+async def run_load(args):
+    env = {**os.environ, "COINGECKO_BASE_URL": args.base_url}
+    if args.cache_ttl is not None:
+        env["COINGECKO_CACHE_TTL"] = str(args.cache_ttl)
+    if args.rate_per_minute is not None:
+        env["COINGECKO_RATE_PER_MINUTE"] = str(args.rate_per_minute)
+    server = StdioServerParameters(command=sys.executable, args=[str(SERVER_PATH)], env=env)
+
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with stdio_client(server) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+
+            async def call(tool, arguments):
+                nonlocal errors
+                async with semaphore:
+                    start = time.perf_counter()
+                    try:
+                        result = await session.call_tool(tool, arguments)
+                        text = "".join(getattr(block, "text", "") for block in result.content)
+                        failed = result.isError or text.startswith(ERROR_PREFIXES)
+                    except Exception:
+                        failed = True
+                    latencies.append(time.perf_counter() - start)
+                    if failed:
+                        errors += 1
+
+            calls = build_calls(args)
+            wall_start = time.perf_counter()
+            await asyncio.gather(*(call(tool, arguments) for tool, arguments in calls))
+            wall = time.perf_counter() - wall_start
+
+            stats = await session.call_tool("get_server_stats", {})
+            server_stats = "".join(getattr(block, "text", "") for block in stats.content)
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "server_stats": server_stats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the crypto MCP server")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8765/api/v3",
+                        help="CoinGecko base URL the server should use")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--tool", help="Call only this tool (default: mixed get_crypto_market_info)")
+    parser.add_argument("--arguments", help="JSON arguments for --tool")
+    parser.add_argument("--output-format", default="text", help="output_format for the default mix")
+    parser.add_argument("--cache-ttl", type=float, help="Override COINGECKO_CACHE_TTL (0 disables caching)")
+    parser.add_argument("--rate-per-minute", type=float, help="Override COINGECKO_RATE_PER_MINUTE")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_load(args))
+    for key, value in report.items():
+        if key != "server_stats":
+            print(f"{key:16} {value}")
+    print(report["server_stats"])
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
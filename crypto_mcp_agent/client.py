@@ -1,5 +1,8 @@
 import asyncio
 import gradio as gr
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from langchain_core.messages import AIMessage, HumanMessage
 from langchain_groq import ChatGroq
 from mcp_use import MCPClient, MCPAgent
 import os
@@ -10,29 +13,100 @@ load_dotenv()
 os.environ["GROQ_API_KEY"] = os.getenv("GROQ_API_KEY")
 config_file = "crypto_mcp_agent/config.json"
 
-# Initialize MCP client and agent
+# Most concurrent browser sessions that keep their own agent memory
+MAX_AGENTS = int(os.getenv("MCP_MAX_AGENTS", "32"))
+
+# One MCP client (and server session) and one LLM shared by every user
 client = MCPClient.from_config_file(config_file)
 llm = ChatGroq(model="qwen-qwq-32b")
-agent = MCPAgent(
-    llm=llm,
-    client=client,
-    max_steps=15,
-    memory_enabled=True
-)
-
-# Store chat history
-chat_history = []
-
-async def process_user_input(user_input, history):
-    global chat_history
+
+
+@dataclass
+class PooledAgent:
+    agent: MCPAgent
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    ready: bool = False
+
+
+class AgentPool:
+    """Per-session MCPAgents on top of the shared MCPClient.
+
+    Agents are keyed by Gradio session hash and evicted least recently used
+    once MAX_AGENTS is reached. Each agent has its own lock so one user's
+    turns run in order while different users run concurrently. Everything
+    runs on Gradio's event loop; no handler starts a loop of its own.
+
+    The pool alone owns the shared MCP sessions: it creates them once and
+    initializes each agent against them. Turns never go through
+    MCPAgent.run, whose cleanup closes the client's sessions; they stream
+    from the agent's executor (see stream_response), so nothing but the
+    process exiting closes the sessions every agent shares.
+    """
+
+    def __init__(self, client, llm, max_agents=MAX_AGENTS):
+        self.client = client
+        self.llm = llm
+        self.max_agents = max_agents
+        self._agents = OrderedDict()  # session hash -> PooledAgent
+        self._sessions_lock = asyncio.Lock()
+
+    async def _ensure_sessions(self):
+        # Create the server sessions once; agents pick up the active ones
+        async with self._sessions_lock:
+            if not self.client.get_all_active_sessions():
+                await self.client.create_all_sessions()
+
+    async def acquire(self, session_id):
+        """Initialized agent for this browser session, created on first use"""
+        # No await between lookup and insert, so concurrent calls for the
+        # same session always share one entry
+        entry = self._agents.get(session_id)
+        if entry is None:
+            entry = PooledAgent(MCPAgent(
+                llm=self.llm,
+                client=self.client,
+                max_steps=15,
+                memory_enabled=True
+            ))
+            self._agents[session_id] = entry
+            while len(self._agents) > self.max_agents:
+                # Only the memory is dropped; the shared sessions stay open
+                self._agents.popitem(last=False)
+        else:
+            self._agents.move_to_end(session_id)
+
+        async with entry.lock:
+            if not entry.ready:
+                # A failure leaves ready False, so the next turn retries
+                await self._ensure_sessions()
+                await entry.agent.initialize()
+                entry.ready = True
+        return entry
+
+    def release(self, session_id):
+        self._agents.pop(session_id, None)
+
+    def clear(self, session_id):
+        entry = self._agents.get(session_id)
+        if entry is not None:
+            entry.agent.clear_conversation_history()
+
+
+agent_pool = AgentPool(client, llm)
+
+
+def session_id(request):
+    return request.session_hash if request is not None else "default"
+
+
+async def process_user_input(user_input, history, request: gr.Request):
+    sid = session_id(request)
     if user_input.lower() == "exit":
+        agent_pool.release(sid)
         yield history + [["You", "Ending Conversation"]]
-        if client and client.sessions():
-            await client.close_all_sessions()
         return
     elif user_input.lower() == "clear":
-        agent.clear_conversation_history()
-        chat_history = []
+        agent_pool.clear(sid)
         yield [["System", "Memory Rebooted"]]
         return
 
@@ -40,32 +114,97 @@ async def process_user_input(user_input, history):
     history.append(["You", user_input])
     yield history
 
-    # Process agent response
+    # Process agent response, streaming tool calls and tokens as they arrive
+    history.append(["Assistant", ""])
     try:
-        response = await agent.run(user_input)
-        history.append(["Assistant", response])
-        yield history
+        entry = await agent_pool.acquire(sid)
+        async with entry.lock:
+            async for text in stream_response(entry.agent, user_input):
+                history[-1][1] = text
+                yield history
     except Exception as e:
         history.append(["System", f"Error: {str(e)}"])
         yield history
 
+async def stream_response(agent, user_input):
+    """Yield the assistant message as it grows: tool calls so far plus the
+    tokens of the model turn currently being generated.
+
+    mcp-use 1.2.8 (the pinned version) only offers the blocking run(), so
+    this streams LangChain events from the agent's executor directly and
+    records the turn in the agent's memory the way run() does.
+    """
+    executor = getattr(agent, "_agent_executor", None)
+    if executor is None:
+        raise RuntimeError(
+            "MCPAgent has no _agent_executor; streaming needs an initialized "
+            "agent from mcp-use 1.2.8 (pinned in requirements.txt)"
+        )
+    executor.max_iterations = agent.max_steps
+    chat_history = [
+        message for message in agent.get_conversation_history()
+        if isinstance(message, (HumanMessage, AIMessage))
+    ]
+
+    tool_lines = []
+    answer = ""
+    final = None
+
+    def render():
+        if not tool_lines:
+            return answer
+        return "\n".join(tool_lines) + ("\n\n" + answer if answer else "")
+
+    async for event in executor.astream_events(
+        {"input": user_input, "chat_history": chat_history}, version="v2"
+    ):
+        kind = event["event"]
+        if kind == "on_chat_model_start":
+            # Each agent step is a new model turn; only the last one is the answer
+            answer = ""
+        elif kind == "on_chat_model_stream":
+            content = getattr(event["data"].get("chunk"), "content", "")
+            if isinstance(content, str) and content:
+                answer += content
+                yield render()
+        elif kind == "on_tool_start":
+            tool_lines.append(f"🔧 Calling `{event['name']}`...")
+            answer = ""
+            yield render()
+        elif kind == "on_tool_end":
+            if tool_lines:
+                tool_lines[-1] = tool_lines[-1].replace("...", " ✓")
+            yield render()
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            # The executor's own end event carries the parsed final answer
+            output = event["data"].get("output")
+            if isinstance(output, dict):
+                final = output.get("output")
+
+    if final is not None:
+        answer = final
+        yield render()
+    if agent.memory_enabled:
+        agent.add_to_history(HumanMessage(content=user_input))
+        agent.add_to_history(AIMessage(content=answer))
+
 def update_chat_history(history):
     """Format chat history for Gradio Chatbot component"""
     return [(msg[0], msg[1]) for msg in history]
 
-def clear_conversation():
-    """Clear the conversation history and reset the agent"""
-    global chat_history
-    agent.clear_conversation_history()
-    chat_history = []
+async def clear_conversation(request: gr.Request):
+    """Clear this session's conversation history and reset its agent"""
+    agent_pool.clear(session_id(request))
     return [["System", "Memory Rebooted"]], ""
 
-def exit_conversation():
-    """Simulate exit and close sessions"""
-    global chat_history
-    asyncio.run(client.close_all_sessions())
-    chat_history.append(["System", "Conversation Ended"])
-    return chat_history, ""
+async def exit_conversation(history, request: gr.Request):
+    """End this session and free its agent; the shared MCP session stays up"""
+    agent_pool.release(session_id(request))
+    history = (history or []) + [["System", "Conversation Ended"]]
+    return history, ""
+
+async def release_session(request: gr.Request):
+    agent_pool.release(session_id(request))
 
 # Gradio interface
 with gr.Blocks(title="MCP Interactive Chatbot") as demo:
@@ -113,10 +252,13 @@ with gr.Blocks(title="MCP Interactive Chatbot") as demo:
     
     exit_button.click(
         fn=exit_conversation,
-        inputs=None,
+        inputs=chatbot,
         outputs=[chatbot, user_input]
     )
 
+    # Free the agent when the browser tab goes away
+    demo.unload(release_session)
+
 # Launch the Gradio app
 if __name__ == "__main__":
-    demo.launch()
\ No newline at end of file
+    demo.queue(default_concurrency_limit=MAX_AGENTS).launch()
\ No newline at end of file
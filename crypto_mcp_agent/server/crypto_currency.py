@@ -7,23 +7,137 @@
 
 
 
+import os
+import json
+import time
+from pathlib import Path
 from typing import Any
+from contextlib import asynccontextmanager
+import importlib.util
 import httpx
 from mcp.server.fastmcp import FastMCP
 
+from market_cache import MarketStore
+from price_feed import PriceFeed
+from rate_limiter import AsyncTokenBucket, request_with_backoff
+from formatting import format_markets
+from history_store import HistoryStore, parse_range, summarize
+
+# Overridable so benchmarks can point at a local stand-in (see bench/fake_coingecko.py)
+COINGECKO_BASE_URL = os.getenv("COINGECKO_BASE_URL", "https://api.coingecko.com/api/v3").rstrip("/")
+
+# One pooled client for the life of the server; HTTP/2 needs the optional h2 package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+http_client: httpx.AsyncClient | None = None
+
+# Every CoinGecko request waits for a token; 429s pause the whole bucket
+RATE_PER_MINUTE = float(os.getenv("COINGECKO_RATE_PER_MINUTE", "30"))
+RATE_BURST = float(os.getenv("COINGECKO_RATE_BURST", "5"))
+coingecko_limiter = AsyncTokenBucket(RATE_PER_MINUTE / 60, RATE_BURST)
+
+# Agents ask for the same coins several times within one run
+CACHE_TTL = float(os.getenv("COINGECKO_CACHE_TTL", "30"))
+
+# Coins polled in the background so reads for them never wait on CoinGecko
+WATCHLIST = [coin.strip().lower() for coin in os.getenv("CRYPTO_WATCHLIST", "bitcoin,ethereum").split(",") if coin.strip()]
+WATCHLIST_CURRENCY = os.getenv("CRYPTO_WATCHLIST_CURRENCY", "usd").lower()
+REFRESH_SECONDS = float(os.getenv("CRYPTO_REFRESH_SECONDS", "60"))
+HISTORY_SIZE = int(os.getenv("CRYPTO_HISTORY_SIZE", "1440"))  # 24h at the default cadence
+
+# Daily prices kept on disk so long-range questions need at most one small fetch
+HISTORY_DB = os.getenv("CRYPTO_HISTORY_DB", str(Path(__file__).resolve().parent / ".cache" / "price_history.sqlite3"))
+HISTORY_REFRESH_SECONDS = float(os.getenv("CRYPTO_HISTORY_REFRESH_SECONDS", "300"))
+MAX_HISTORY_DAYS = 365
+
+
+def create_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=HTTP_LIMITS,
+        timeout=HTTP_TIMEOUT,
+        headers={"Accept": "application/json"},
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared client; created on demand if a tool runs outside the server lifespan"""
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = create_http_client()
+    return http_client
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    global http_client
+    http_client = create_http_client()
+    price_feed.start()
+    try:
+        yield {}
+    finally:
+        await price_feed.stop()
+        await http_client.aclose()
+        http_client = None
+
+
 # Initialize FastMCP server
-mcp = FastMCP("crypto_currency")
-COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
+mcp = FastMCP("crypto_currency", lifespan=server_lifespan)
+
+
+async def coingecko_get(path: str, params: dict[str, Any]) -> httpx.Response:
+    """GET against CoinGecko through the shared client and rate limiter"""
+    return await request_with_backoff(
+        get_http_client(), coingecko_limiter, "GET", f"{COINGECKO_BASE_URL}{path}", params=params
+    )
+
+
+async def fetch_markets(ids: list[str], currency: str) -> list[dict[str, Any]]:
+    """Call CoinGecko /coins/markets for the given ids"""
+    params = {
+        "vs_currency": currency,         # Lowercase currency for API compatibility
+        "ids": ",".join(ids),            # Comma-separated crypto IDs
+        "order": "market_cap_desc",      # Order by market cap
+        "page": 1,                       # Page number
+        "sparkline": "false"             # Exclude sparkline data
+    }
+    response = await coingecko_get("/coins/markets", params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def fetch_market_chart(coin_id: str, currency: str, days: int) -> dict[str, Any]:
+    """Call CoinGecko /coins/{id}/market_chart for daily points over the last `days` days"""
+    params = {"vs_currency": currency, "days": days, "interval": "daily"}
+    response = await coingecko_get(f"/coins/{coin_id}/market_chart", params)
+    response.raise_for_status()
+    return response.json()
+
+
+# Per-coin records, so overlapping id sets only fetch what is missing or stale
+market_store = MarketStore(ttl=CACHE_TTL, fetch_batch=fetch_markets)
+price_feed = PriceFeed(
+    WATCHLIST, WATCHLIST_CURRENCY, REFRESH_SECONDS, HISTORY_SIZE,
+    fetch_batch=fetch_markets, store=market_store,
+)
+history_store = HistoryStore(HISTORY_DB, fetch_market_chart, HISTORY_REFRESH_SECONDS)
 
 
 @mcp.tool()
-async def get_crypto_market_info(crypto_ids: str, currency: str = "usd") -> str:
+async def get_crypto_market_info(crypto_ids: str, currency: str = "usd",
+                                 output_format: str = "text", fields: str = "") -> str:
     """
     Get market information for one or more cryptocurrencies.
     
     Parameters:
     - crypto_ids: Comma-separated list of cryptocurrency IDs (e.g., 'bitcoin,ethereum')
     - currency: The currency to display values in (default: 'usd')
+    - output_format: 'text' (verbose, default), 'table' or 'json' (compact, far fewer tokens)
+    - fields: For table/json, comma-separated fields from: id, name, symbol, rank, price,
+      market_cap, volume, change_24h, high_24h, low_24h, ath, supply
+      (default: symbol,price,change_24h,market_cap)
     
     Returns:
     - Market information including price, market cap, volume, and price changes
@@ -32,58 +146,235 @@ async def get_crypto_market_info(crypto_ids: str, currency: str = "usd") -> str:
     if not crypto_ids or not isinstance(crypto_ids, str):
         return "Error: crypto_ids must be a non-empty string."
     
-    # Construct the API URL
-    url = f"{COINGECKO_BASE_URL}/coins/markets"
+    ids = sorted({coin.strip().lower() for coin in crypto_ids.split(",") if coin.strip()})
+    if not ids:
+        return "Error: crypto_ids must contain at least one cryptocurrency ID."
+    currency = currency.lower()
     
-    # Set up the query parameters
+    try:
+        # Missing or stale coins are fetched in one batch; the rest come from the store
+        data = await market_store.get_many(ids, currency)
+        
+        # Check if we got any data
+        if not data:
+            return f"No data found for cryptocurrencies: '{crypto_ids}'. Please check the IDs and try again."
+        
+        return format_markets(data, currency, output_format, fields)
+        
+    except ValueError as e:
+        return f"Error: {str(e)}"
+    except httpx.HTTPStatusError as e:
+        return f"HTTP error fetching market data: {str(e)}"
+    except httpx.RequestError as e:
+        return f"Network error fetching market data: {str(e)}"
+    except Exception as e:
+        return f"Unexpected error fetching market data: {str(e)}"
+
+
+@mcp.tool()
+async def get_top_crypto_markets(currency: str = "usd", limit: int = 10, page: int = 1,
+                                 output_format: str = "table", fields: str = "") -> str:
+    """
+    Get the top cryptocurrencies by market cap, one page at a time.
+    
+    Parameters:
+    - currency: The currency to display values in (default: 'usd')
+    - limit: Coins per page, 1-250 (default: 10)
+    - page: Page number starting at 1 (default: 1)
+    - output_format: 'table' (default), 'json' or 'text'
+    - fields: Comma-separated fields, as for get_crypto_market_info
+    
+    Returns:
+    - Ranked market data for the requested page
+    """
+    if not 1 <= limit <= 250 or page < 1:
+        return "Error: limit must be between 1 and 250 and page must be at least 1."
+    currency = currency.lower()
     params = {
-        "vs_currency": currency.lower(),  # Ensure currency is lowercase for API compatibility
-        "ids": crypto_ids,               # Comma-separated crypto IDs
-        "order": "market_cap_desc",      # Order by market cap
-        "page": 1,                       # Page number
-        "sparkline": "false"             # Exclude sparkline data
+        "vs_currency": currency,
+        "order": "market_cap_desc",
+        "per_page": limit,
+        "page": page,
+        "sparkline": "false",
     }
     
     try:
-        # Make the API call
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, timeout=10.0)
-            response.raise_for_status()
-            
-            # Parse the response
-            data = response.json()
-            
-            # Check if we got any data
-            if not data:
-                return f"No data found for cryptocurrencies: '{crypto_ids}'. Please check the IDs and try again."
-            
-            # Format the results
-            result = ""
-            for crypto in data:
-                name = crypto.get('name', 'Unknown')
-                symbol = crypto.get('symbol', '???').upper()
-                price = crypto.get('current_price', 'Unknown')
-                market_cap = crypto.get('market_cap', 'Unknown')
-                volume = crypto.get('total_volume', 'Unknown')
-                price_change = crypto.get('price_change_percentage_24h', 'Unknown')
-                
-                # Format numbers for readability
-                price_str = f"{price:.2f}" if isinstance(price, (int, float)) else str(price)
-                market_cap_str = f"{market_cap:,.0f}" if isinstance(market_cap, (int, float)) else str(market_cap)
-                volume_str = f"{volume:,.0f}" if isinstance(volume, (int, float)) else str(volume)
-                price_change_str = f"{price_change:.2f}" if isinstance(price_change, (int, float)) else str(price_change)
-                
-                result += f"{name} ({symbol}):\n"
-                result += f"Current price: {price_str} {currency.upper()}\n"
-                result += f"Market cap: {market_cap_str} {currency.upper()}\n"
-                result += f"24h trading volume: {volume_str} {currency.upper()}\n"
-                result += f"24h price change: {price_change_str}%\n\n"
-            
-            return result.strip()  # Remove trailing newline
-            
+        response = await coingecko_get("/coins/markets", params)
+        response.raise_for_status()
+        data = response.json()
+        if not data:
+            return f"No market data on page {page}."
+        
+        # Warm the per-coin store for follow-up get_crypto_market_info calls
+        market_store.put(data, currency)
+        header = f"Top coins by market cap, page {page} ({limit} per page)"
+        return f"{header}\n{format_markets(data, currency, output_format, fields)}"
+        
+    except ValueError as e:
+        return f"Error: {str(e)}"
     except httpx.HTTPStatusError as e:
         return f"HTTP error fetching market data: {str(e)}"
     except httpx.RequestError as e:
         return f"Network error fetching market data: {str(e)}"
     except Exception as e:
-        return f"Unexpected error fetching market data: {str(e)}"
\ No newline at end of file
+        return f"Unexpected error fetching market data: {str(e)}"
+
+
+@mcp.tool()
+async def get_watchlist_prices(crypto_ids: str = "") -> str:
+    """
+    Get the latest background-refreshed prices for watched cryptocurrencies.
+    Answers instantly from memory, including 1h and 24h changes computed locally.
+    
+    Parameters:
+    - crypto_ids: Comma-separated watched IDs (default: the whole watchlist)
+    
+    Returns:
+    - Latest price, 1h and 24h change for each coin, and the snapshot age
+    """
+    ids = [coin.strip().lower() for coin in crypto_ids.split(",") if coin.strip()] or WATCHLIST
+    if price_feed.last_refresh is None:
+        return "The price feed has not completed its first refresh yet. Use get_crypto_market_info instead."
+    
+    lines = []
+    for coin_id in ids:
+        record = price_feed.latest(coin_id)
+        if not price_feed.is_watched(coin_id) or record is None:
+            lines.append(f"{coin_id}: not on the watchlist ({', '.join(WATCHLIST)}); use get_crypto_market_info")
+            continue
+        change_1h = price_feed.change_pct(coin_id, 3600)
+        change_24h = price_feed.change_pct(coin_id, 24 * 3600)
+        if change_24h is None:
+            change_24h = record.get("price_change_percentage_24h")
+        lines.append(
+            f"{record.get('name', coin_id)} ({record.get('symbol', '???').upper()}): "
+            f"{record.get('current_price')} {WATCHLIST_CURRENCY.upper()}, "
+            f"1h {_format_pct(change_1h)}, 24h {_format_pct(change_24h)}"
+        )
+    
+    age = time.time() - price_feed.last_refresh
+    lines.append(f"(snapshot {age:.0f}s old)")
+    return "\n".join(lines)
+
+
+@mcp.tool()
+async def get_recent_price_history(crypto_id: str, minutes: int = 60) -> str:
+    """
+    Get recent price samples for a watched cryptocurrency from the in-memory feed.
+    
+    Parameters:
+    - crypto_id: A single watched cryptocurrency ID (e.g., 'bitcoin')
+    - minutes: How far back to look (default: 60)
+    
+    Returns:
+    - Timestamped price samples plus the min, max and change over the window
+    """
+    coin_id = crypto_id.strip().lower()
+    if not price_feed.is_watched(coin_id):
+        return f"Error: {coin_id} is not on the watchlist ({', '.join(WATCHLIST)})."
+    
+    samples = price_feed.history(coin_id, minutes * 60)
+    if not samples:
+        return f"No samples for {coin_id} in the last {minutes} minutes yet."
+    
+    prices = [price for _, price in samples]
+    change = (prices[-1] - prices[0]) / prices[0] * 100 if prices[0] else None
+    lines = [
+        f"{coin_id} over the last {minutes} min ({len(samples)} samples, {WATCHLIST_CURRENCY.upper()}): "
+        f"min {min(prices)}, max {max(prices)}, change {_format_pct(change)}"
+    ]
+    lines.extend(
+        f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(ts))}Z {price}" for ts, price in samples
+    )
+    return "\n".join(lines)
+
+
+@mcp.tool()
+async def get_historical_prices(crypto_id: str, days: int = 30, currency: str = "usd",
+                                start_date: str = "", end_date: str = "",
+                                output_format: str = "summary") -> str:
+    """
+    Get daily historical prices for a cryptocurrency, served from a local store.
+    
+    Parameters:
+    - crypto_id: A single cryptocurrency ID (e.g., 'bitcoin')
+    - days: Days back from end_date when start_date is not given (default: 30, max 365)
+    - currency: The currency to display values in (default: 'usd')
+    - start_date / end_date: Optional UTC dates as YYYY-MM-DD (end_date defaults to today)
+    - output_format: 'summary' (open/high/low/close and change, default),
+      'table' (summary plus one line per day) or 'json'
+    
+    Returns:
+    - Price summary over the range, optionally with the daily series
+    """
+    coin_id = crypto_id.strip().lower()
+    if not coin_id or "," in coin_id:
+        return "Error: crypto_id must be a single cryptocurrency ID."
+    currency = currency.lower()
+    
+    try:
+        start, end = parse_range(days, start_date, end_date)
+        if (end - start).days > MAX_HISTORY_DAYS:
+            return f"Error: ranges are limited to {MAX_HISTORY_DAYS} days."
+        rows = await history_store.get_range(coin_id, currency, start, end)
+        if not rows:
+            return f"No price history for {coin_id} between {start} and {end}."
+        
+        summary = summarize(rows)
+        if output_format == "json":
+            return json.dumps({
+                "id": coin_id,
+                "currency": currency,
+                "summary": summary,
+                "daily": [{"date": day, "price": price} for day, price, _, _ in rows],
+            }, separators=(",", ":"))
+        
+        lines = [
+            f"{coin_id} {summary['start']} to {summary['end']} ({summary['days']} days, {currency.upper()}): "
+            f"open {summary['open']:.8g}, high {summary['high']:.8g}, low {summary['low']:.8g}, "
+            f"close {summary['close']:.8g}, change {_format_pct(summary['change_pct'])}"
+        ]
+        if output_format == "table":
+            lines.append("date|price|market_cap|volume")
+            lines.extend(
+                f"{day}|{price:.8g}|{market_cap or 0:.0f}|{volume or 0:.0f}"
+                for day, price, market_cap, volume in rows
+            )
+        return "\n".join(lines)
+        
+    except ValueError as e:
+        return f"Error: {str(e)}"
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            return f"Error: unknown cryptocurrency ID '{coin_id}'."
+        return f"HTTP error fetching price history: {str(e)}"
+    except httpx.RequestError as e:
+        return f"Network error fetching price history: {str(e)}"
+    except Exception as e:
+        return f"Unexpected error fetching price history: {str(e)}"
+
+
+@mcp.tool()
+async def get_server_stats() -> str:
+    """
+    Get diagnostics for this server: rate limiter queue depth and wait times,
+    market data cache hit rates and the size of the local price history.
+    """
+    limiter = coingecko_limiter.stats()
+    store = market_store.stats()
+    history = history_store.stats()
+    lines = ["Rate limiter:"]
+    lines.extend(f"- {key}: {value}" for key, value in limiter.items())
+    lines.append("Market data cache:")
+    lines.extend(f"- {key}: {value}" for key, value in store.items())
+    lines.append("Price history store:")
+    lines.extend(f"- {key}: {value}" for key, value in history.items())
+    return "\n".join(lines)
+
+
+def _format_pct(value) -> str:
+    return f"{value:+.2f}%" if isinstance(value, (int, float)) else "n/a"
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,109 @@
+# formatting.py
+import json
+from typing import Any
+
+# Short field names accepted by the tools -> CoinGecko /coins/markets keys
+FIELDS = {
+    "id": "id",
+    "name": "name",
+    "symbol": "symbol",
+    "rank": "market_cap_rank",
+    "price": "current_price",
+    "market_cap": "market_cap",
+    "volume": "total_volume",
+    "change_24h": "price_change_percentage_24h",
+    "high_24h": "high_24h",
+    "low_24h": "low_24h",
+    "ath": "ath",
+    "supply": "circulating_supply",
+}
+DEFAULT_COMPACT_FIELDS = ["symbol", "price", "change_24h", "market_cap"]
+OUTPUT_FORMATS = ("text", "table", "json")
+
+
+def parse_fields(fields: str) -> list[str]:
+    """Validate a comma-separated field list; raises ValueError on unknown names"""
+    names = [name.strip().lower() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; choose from {', '.join(FIELDS)}")
+    return names or DEFAULT_COMPACT_FIELDS
+
+
+def _compact_number(value: Any) -> Any:
+    """Round for the LLM: 1234567890 -> '1.23B', prices to 8 significant digits"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    for threshold, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M")):
+        if abs(value) >= threshold:
+            return f"{value / threshold:.2f}{suffix}"
+    return float(f"{value:.8g}")
+
+
+def _row(record: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+    row = {}
+    for name in fields:
+        value = record.get(FIELDS[name])
+        if name == "symbol" and isinstance(value, str):
+            value = value.upper()
+        elif name == "change_24h" and isinstance(value, (int, float)):
+            value = round(value, 2)
+        else:
+            value = _compact_number(value)
+        row[name] = value
+    return row
+
+
+def format_text(records: list[dict[str, Any]], currency: str) -> str:
+    """The original verbose, human-readable format"""
+    currency = currency.upper()
+    blocks = []
+    for crypto in records:
+        price = crypto.get('current_price', 'Unknown')
+        market_cap = crypto.get('market_cap', 'Unknown')
+        volume = crypto.get('total_volume', 'Unknown')
+        price_change = crypto.get('price_change_percentage_24h', 'Unknown')
+
+        # Format numbers for readability
+        price_str = f"{price:.2f}" if isinstance(price, (int, float)) else str(price)
+        market_cap_str = f"{market_cap:,.0f}" if isinstance(market_cap, (int, float)) else str(market_cap)
+        volume_str = f"{volume:,.0f}" if isinstance(volume, (int, float)) else str(volume)
+        price_change_str = f"{price_change:.2f}" if isinstance(price_change, (int, float)) else str(price_change)
+
+        blocks.append("\n".join([
+            f"{crypto.get('name', 'Unknown')} ({crypto.get('symbol', '???').upper()}):",
+            f"Current price: {price_str} {currency}",
+            f"Market cap: {market_cap_str} {currency}",
+            f"24h trading volume: {volume_str} {currency}",
+            f"24h price change: {price_change_str}%",
+        ]))
+    return "\n\n".join(blocks)
+
+
+def format_table(records: list[dict[str, Any]], fields: list[str], currency: str) -> str:
+    """Pipe-separated table with one header line"""
+    lines = [f"# {currency.upper()}", "|".join(fields)]
+    for record in records:
+        row = _row(record, fields)
+        lines.append("|".join("" if value is None else str(value) for value in row.values()))
+    return "\n".join(lines)
+
+
+def format_json(records: list[dict[str, Any]], fields: list[str], currency: str) -> str:
+    return json.dumps(
+        {"currency": currency, "data": [_row(record, fields) for record in records]},
+        separators=(",", ":"),
+    )
+
+
+def format_markets(records: list[dict[str, Any]], currency: str,
+                   output_format: str = "text", fields: str = "") -> str:
+    output_format = output_format.lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {', '.join(OUTPUT_FORMATS)}")
+    if output_format == "text":
+        return format_text(records, currency)
+    selected = parse_fields(fields)
+    if output_format == "table":
+        return format_table(records, selected, currency)
+    return format_json(records, selected, currency)
@@ -0,0 +1,165 @@
+# history_store.py
+import time
+import sqlite3
+import asyncio
+import threading
+from pathlib import Path
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+# (coin id, currency, days back from today) -> CoinGecko /market_chart payload
+FetchChart = Callable[[str, str, int], Awaitable[dict[str, Any]]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_prices (
+    coin_id TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    day TEXT NOT NULL,
+    price REAL NOT NULL,
+    market_cap REAL,
+    volume REAL,
+    PRIMARY KEY (coin_id, currency, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    coin_id TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    first_day TEXT NOT NULL,
+    last_day TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (coin_id, currency)
+);
+"""
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class HistoryStore:
+    """Daily price history persisted in SQLite.
+
+    Rows are clustered by (coin, currency, day), so a range query is one
+    index scan. A coverage row records the span already fetched; a query
+    only goes upstream for the part it is missing, as a single
+    /market_chart call. Finished days never change, so they are fetched
+    once; today's price is refreshed at most every `refresh_seconds`.
+    """
+
+    def __init__(self, path: str | Path, fetch_chart: FetchChart, refresh_seconds: float = 300):
+        self.path = Path(path)
+        self.fetch_chart = fetch_chart
+        self.refresh_seconds = refresh_seconds
+        self.upstream_calls = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+        # Concurrent queries for the same series wait on one fetch
+        self._fetch_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    def _coverage(self, coin_id: str, currency: str):
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT first_day, last_day, fetched_at FROM coverage WHERE coin_id = ? AND currency = ?",
+                (coin_id, currency),
+            ).fetchone()
+
+    def _days_to_fetch(self, coin_id: str, currency: str, start: date, end: date) -> int:
+        """How many days back from today to request, or 0 if the store covers the range"""
+        today = utc_today()
+        coverage = self._coverage(coin_id, currency)
+        if coverage is None:
+            return (today - start).days + 1
+
+        first_day, last_day, fetched_at = coverage
+        if start < date.fromisoformat(first_day):
+            # The API counts back from today, so the head gap means refetching to the start
+            return (today - start).days + 1
+        # last_day is the last finished day at fetch time; anything later may have moved
+        last_day = date.fromisoformat(last_day)
+        if end <= last_day:
+            return 0
+        if last_day == today - timedelta(days=1) and time.time() - fetched_at < self.refresh_seconds:
+            return 0
+        return (today - last_day).days
+
+    def _save_chart(self, coin_id: str, currency: str, chart: dict[str, Any], start: date):
+        # One point per UTC day; later points in a day (today's live price) win
+        rows: dict[str, list] = {}
+        for series, column in (("prices", 0), ("market_caps", 1), ("total_volumes", 2)):
+            for ms, value in chart.get(series) or []:
+                if value is None:
+                    continue
+                day = datetime.fromtimestamp(ms / 1000, timezone.utc).date().isoformat()
+                rows.setdefault(day, [None, None, None])[column] = value
+
+        today = utc_today()
+        with self._db_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO daily_prices VALUES (?, ?, ?, ?, ?, ?)",
+                [(coin_id, currency, day, *values) for day, values in rows.items() if values[0] is not None],
+            )
+            existing = self._conn.execute(
+                "SELECT first_day FROM coverage WHERE coin_id = ? AND currency = ?",
+                (coin_id, currency),
+            ).fetchone()
+            # Days before a coin's listing have no data; mark them covered anyway
+            first_day = min(start, date.fromisoformat(existing[0])) if existing else start
+            self._conn.execute(
+                "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?)",
+                (coin_id, currency, first_day.isoformat(), (today - timedelta(days=1)).isoformat(), time.time()),
+            )
+
+    async def get_range(self, coin_id: str, currency: str, start: date, end: date) -> list[tuple]:
+        """(day, price, market_cap, volume) rows for start..end inclusive, oldest first"""
+        key = (coin_id, currency)
+        lock = self._fetch_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            days = self._days_to_fetch(coin_id, currency, start, end)
+            if days:
+                self.upstream_calls += 1
+                chart = await self.fetch_chart(coin_id, currency, days)
+                self._save_chart(coin_id, currency, chart, start)
+
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT day, price, market_cap, volume FROM daily_prices "
+                "WHERE coin_id = ? AND currency = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (coin_id, currency, start.isoformat(), end.isoformat()),
+            ).fetchall()
+
+    def stats(self) -> dict[str, Any]:
+        with self._db_lock:
+            rows, series = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT coin_id || '/' || currency) FROM daily_prices"
+            ).fetchone()
+        return {"upstream_calls": self.upstream_calls, "series": series, "rows": rows}
+
+
+def summarize(rows: list[tuple]) -> dict[str, Any]:
+    """Open/high/low/close and change over daily closes"""
+    prices = [row[1] for row in rows]
+    first, last = prices[0], prices[-1]
+    return {
+        "start": rows[0][0],
+        "end": rows[-1][0],
+        "days": len(rows),
+        "open": first,
+        "high": max(prices),
+        "low": min(prices),
+        "close": last,
+        "change_pct": (last - first) / first * 100 if first else None,
+    }
+
+
+def parse_range(days: int, start_date: str, end_date: str) -> tuple[date, date]:
+    """Resolve the tool arguments to an inclusive (start, end) UTC date range"""
+    today = utc_today()
+    end = date.fromisoformat(end_date) if end_date else today
+    start = date.fromisoformat(start_date) if start_date else end - timedelta(days=days)
+    if end > today:
+        end = today
+    if start > end:
+        raise ValueError("start_date must be on or before end_date.")
+    return start, end
@@ -0,0 +1,116 @@
+# market_cache.py
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable
+
+FetchBatch = Callable[[list[str], str], Awaitable[list[dict[str, Any]]]]
+
+
+class MarketStore:
+    """Per-coin cache of CoinGecko /coins/markets records.
+
+    Records are stored per (currency, coin id), so overlapping requests such
+    as 'bitcoin,ethereum' and 'ethereum,solana' share data. Only ids that are
+    missing or older than `ttl` are fetched, in one batched call, and a coin
+    already being fetched by another caller is awaited rather than refetched.
+    Unknown ids are remembered too, so they are not requested on every call.
+    Records stored with put() may carry their own ttl, e.g. to stay fresh
+    until a background refresher's next poll.
+    """
+
+    def __init__(self, ttl: float, fetch_batch: FetchBatch):
+        self.ttl = ttl
+        self.fetch_batch = fetch_batch
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        # (currency, coin id) -> (expires_at, record or None for unknown ids)
+        self._records: dict[tuple[str, str], tuple[float, dict[str, Any] | None]] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+    def _fresh(self, key) -> bool:
+        entry = self._records.get(key)
+        return entry is not None and time.monotonic() < entry[0]
+
+    async def get_many(self, ids: Iterable[str], currency: str) -> list[dict[str, Any]]:
+        """Records for the known ids, ordered by market cap like the upstream API"""
+        ids = list(dict.fromkeys(ids))
+        # This call's records are collected here, so a purge or ttl=0 between
+        # the freshness check and the response cannot drop them
+        found: dict[str, dict[str, Any] | None] = {}
+        pending: set[asyncio.Task] = set()
+        to_fetch = []
+
+        for coin_id in ids:
+            key = (currency, coin_id)
+            if self._fresh(key):
+                self.hits += 1
+                found[coin_id] = self._records[key][1]
+            elif key in self._inflight:
+                self.coalesced += 1
+                pending.add(self._inflight[key])
+            else:
+                self.misses += 1
+                to_fetch.append(coin_id)
+
+        if to_fetch:
+            task = asyncio.create_task(self._fetch(to_fetch, currency))
+            keys = [(currency, coin_id) for coin_id in to_fetch]
+            for key in keys:
+                self._inflight[key] = task
+            task.add_done_callback(lambda done: self._clear_inflight(keys, done))
+            pending.add(task)
+
+        if pending:
+            # shield so one cancelled caller does not cancel a fetch others wait on
+            for fetched in await asyncio.gather(*(asyncio.shield(task) for task in pending)):
+                for coin_id, record in fetched.items():
+                    found.setdefault(coin_id, record)
+
+        records = [found.get(coin_id) for coin_id in ids]
+        records = [record for record in records if record is not None]
+        return sorted(records, key=lambda r: r.get("market_cap") or 0, reverse=True)
+
+    def put(self, records: Iterable[dict[str, Any]], currency: str, ttl: float | None = None):
+        """Store records fetched elsewhere (e.g. by a background refresher)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        for record in records:
+            self._records[(currency, record["id"])] = (expires_at, record)
+
+    async def _fetch(self, ids: list[str], currency: str) -> dict[str, dict[str, Any] | None]:
+        """Fetch and store `ids`; returns coin id -> record (None for unknown ids)"""
+        self.upstream_calls += 1
+        data = await self.fetch_batch(ids, currency)
+        expires_at = time.monotonic() + self.ttl
+        by_id = {record.get("id"): record for record in data}
+        fetched = {coin_id: by_id.get(coin_id) for coin_id in ids}
+        for coin_id, record in fetched.items():
+            self._records[(currency, coin_id)] = (expires_at, record)
+        self.purge_expired()
+        return fetched
+
+    def _clear_inflight(self, keys, task):
+        for key in keys:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def purge_expired(self):
+        """Drop stale records, except those a fetch in flight is about to replace"""
+        now = time.monotonic()
+        expired = [
+            key for key, (expires_at, _) in self._records.items()
+            if now >= expires_at and key not in self._inflight
+        ]
+        for key in expired:
+            del self._records[key]
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "coins_cached": len(self._records),
+            "in_flight": len(self._inflight),
+        }
@@ -0,0 +1,97 @@
+# price_feed.py
+import sys
+import time
+import asyncio
+from collections import deque
+from typing import Any
+
+from market_cache import FetchBatch, MarketStore
+
+
+class PriceFeed:
+    """Background poller for a watchlist of coins.
+
+    Every `interval` seconds the watchlist is fetched in one batch, written
+    into the shared MarketStore and appended to a per-coin ring buffer of
+    (timestamp, price) samples. Reads never touch the network.
+    """
+
+    def __init__(self, watchlist: list[str], currency: str, interval: float,
+                 history_size: int, fetch_batch: FetchBatch, store: MarketStore):
+        self.watchlist = watchlist
+        self.currency = currency
+        self.interval = interval
+        self.fetch_batch = fetch_batch
+        self.store = store
+        self.last_refresh: float | None = None
+        self.last_error: str | None = None
+        self._latest: dict[str, dict[str, Any]] = {}
+        self._history: dict[str, deque] = {
+            coin_id: deque(maxlen=history_size) for coin_id in watchlist
+        }
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self.watchlist and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self):
+        records = await self.fetch_batch(self.watchlist, self.currency)
+        now = time.time()
+        # Fresh until the next poll lands, with an interval of slack for a slow one
+        self.store.put(records, self.currency, ttl=max(self.store.ttl, 2 * self.interval))
+        for record in records:
+            coin_id = record.get("id")
+            if coin_id not in self._history:
+                continue
+            self._latest[coin_id] = record
+            price = record.get("current_price")
+            if isinstance(price, (int, float)):
+                self._history[coin_id].append((now, price))
+        self.last_refresh = now
+        self.last_error = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep polling; the last good snapshot stays readable
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"Price feed refresh failed: {self.last_error}", file=sys.stderr)
+            await asyncio.sleep(self.interval)
+
+    def is_watched(self, coin_id: str) -> bool:
+        return coin_id in self._history
+
+    def latest(self, coin_id: str) -> dict[str, Any] | None:
+        return self._latest.get(coin_id)
+
+    def history(self, coin_id: str, seconds: float) -> list[tuple[float, float]]:
+        cutoff = time.time() - seconds
+        return [sample for sample in self._history.get(coin_id, ()) if sample[0] >= cutoff]
+
+    def change_pct(self, coin_id: str, seconds: float) -> float | None:
+        """Price change over the window, or None if the buffer does not reach back that far"""
+        samples = self._history.get(coin_id)
+        if not samples or len(samples) < 2:
+            return None
+        target = samples[-1][0] - seconds
+        # Oldest sample must cover the window (allow one polling interval of slack)
+        if samples[0][0] > target + self.interval:
+            return None
+        base = next(price for ts, price in reversed(samples) if ts <= target + self.interval)
+        if not base:
+            return None
+        return (samples[-1][1] - base) / base * 100
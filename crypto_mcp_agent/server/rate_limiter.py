@@ -0,0 +1,119 @@
+# rate_limiter.py
+import time
+import random
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class AsyncTokenBucket:
+    """FIFO token bucket shared by every upstream call.
+
+    Callers queue on a fair lock and sleep until a token is available, so
+    bursts are smoothed out instead of failing. `penalize()` blocks the
+    whole bucket, e.g. for the Retry-After of a 429.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+        self.waiting = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.penalties = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._blocked_until > now:
+                        await asyncio.sleep(self._blocked_until - now)
+                        continue
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def penalize(self, seconds: float):
+        """Hold every caller for `seconds` and start again from an empty bucket"""
+        now = time.monotonic()
+        self._blocked_until = max(self._blocked_until, now + seconds)
+        self._refill(now)
+        self._tokens = 0
+        self.penalties += 1
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.waiting,
+            "acquired": self.acquired,
+            "avg_wait_seconds": round(self.total_wait / self.acquired, 4) if self.acquired else 0.0,
+            "max_wait_seconds": round(self.max_wait, 4),
+            "penalties": self.penalties,
+            "blocked_for_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 2),
+        }
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+async def request_with_backoff(client: httpx.AsyncClient, limiter: AsyncTokenBucket,
+                               method: str, url: str, max_retries: int = 5,
+                               base_delay: float = 1.0, max_delay: float = 60.0,
+                               **kwargs) -> httpx.Response:
+    """Rate-limited request that retries 429/5xx and transport errors.
+
+    Waits honour Retry-After when the server sends it and otherwise back off
+    exponentially with jitter. The last response is returned as-is, so the
+    caller still decides how to surface a final failure.
+    """
+    for attempt in range(max_retries + 1):
+        await limiter.acquire()
+        backoff = min(max_delay, base_delay * 2 ** attempt) * random.uniform(1.0, 1.25)
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(backoff)
+            continue
+
+        if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+            return response
+        delay = retry_after_seconds(response)
+        limiter.penalize(min(max_delay, delay) if delay is not None else backoff)
+    return response
@@ -0,0 +1,168 @@
+"""Grade a whole set of essays with the essay grader workflow.
+
+    python essay_grading_agent.py/batch_grade.py essays.csv -o results.jsonl
+    python essay_grading_agent.py/batch_grade.py essays/ -o results.jsonl --concurrency 8
+
+Input is a CSV (id/essay columns), a JSONL file ({"id": ..., "essay": ...})
+or a directory of .txt/.md files. Each result is appended to the output
+JSONL as soon as its essay finishes, and essays already graded in the
+output file are skipped, so an interrupted run resumes where it stopped.
+Essays that failed, including ones where a score could not be read from
+the model's response, are written with an error and graded again next run.
+"""
+import os
+import csv
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from essay_grader import GRADING_MODES
+
+SCORE_KEYS = ["relevance_score", "grammar_score", "structure_score", "depth_score", "final_score"]
+
+
+def load_essays(path, id_column="id", text_column="essay"):
+    """Yield (essay_id, text) pairs from a CSV, JSONL or directory"""
+    path = Path(path)
+    if path.is_dir():
+        for file in sorted(path.iterdir()):
+            if file.suffix.lower() in (".txt", ".md"):
+                yield file.stem, file.read_text(encoding="utf-8")
+    elif path.suffix.lower() == ".csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                yield str(row.get(id_column) or i), row[text_column]
+    elif path.suffix.lower() in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                if line.strip():
+                    row = json.loads(line)
+                    yield str(row.get(id_column, i)), row[text_column]
+    else:
+        raise ValueError(f"Unsupported input: {path} (expected .csv, .jsonl or a directory)")
+
+
+def load_completed_ids(output_path):
+    """Ids that already have a successful result in the output file"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partially written line from a crash
+            if not row.get("error"):
+                done.add(str(row["id"]))
+    return done
+
+
+def is_rate_limit_error(error):
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or "rate limit" in str(error).lower()
+
+
+def retry_after_seconds(error):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimitGate:
+    """Pauses every worker once any of them hits a rate limit"""
+
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def backoff(self, seconds):
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+def grade_one(essay_id, text, gate, mode="sequential", max_retries=6, base_delay=2.0):
+    start = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        gate.wait()
+        try:
+            result = GRADING_MODES[mode](text)
+            if result.get("parse_errors"):
+                # Scored as 0.0 by the workflow; leave it for the next run to retry
+                row = {"id": essay_id, "error": "Unparsed scores: " + "; ".join(result["parse_errors"])}
+            else:
+                row = {"id": essay_id, **{key: result[key] for key in SCORE_KEYS}}
+            break
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == max_retries:
+                row = {"id": essay_id, "error": f"{type(e).__name__}: {e}"}
+                break
+            delay = retry_after_seconds(e) or base_delay * (2 ** attempt)
+            gate.backoff(delay + random.uniform(0, delay / 4))
+    row["seconds"] = round(time.perf_counter() - start, 2)
+    return row
+
+
+def run_batch(input_path, output_path, concurrency=4, mode="sequential",
+              id_column="id", text_column="essay"):
+    done = load_completed_ids(output_path)
+    pending = [
+        (essay_id, text)
+        for essay_id, text in load_essays(input_path, id_column, text_column)
+        if essay_id not in done and text.strip()
+    ]
+    print(f"{len(done)} already graded, {len(pending)} to go")
+
+    gate = RateLimitGate()
+    failures = 0
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(grade_one, essay_id, text, gate, mode)
+            for essay_id, text in pending
+        ]
+        for i, future in enumerate(as_completed(futures), 1):
+            row = future.result()
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
+            if row.get("error"):
+                failures += 1
+                print(f"[{i}/{len(pending)}] {row['id']}: {row['error']}")
+            else:
+                print(f"[{i}/{len(pending)}] {row['id']}: {row['final_score']:.2f}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch essay grading")
+    parser.add_argument("input", help="CSV, JSONL or directory of .txt/.md essays")
+    parser.add_argument("-o", "--output", default="grading_results.jsonl")
+    parser.add_argument("--concurrency", type=int, default=4, help="Essays graded at once")
+    parser.add_argument("--mode", choices=list(GRADING_MODES), default="sequential",
+                        help="single: one structured call per essay; parallel: four concurrent "
+                             "prompts; sequential: the gated workflow graph")
+    parser.add_argument("--id-column", default="id")
+    parser.add_argument("--text-column", default="essay")
+    args = parser.parse_args(argv)
+
+    failures = run_batch(
+        args.input, args.output, args.concurrency, args.mode,
+        args.id_column, args.text_column,
+    )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
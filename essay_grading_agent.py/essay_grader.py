@@ -1,12 +1,16 @@
 import os
 import re
+import json
 import streamlit as st
 from typing import TypedDict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 from langchain_core.prompts import ChatPromptTemplate
 from langgraph.graph import StateGraph, END
 
+from common.groq_clients import get_chat_groq
+from common.llm_cache import cached_invoke
+
 # Load from .env for fallback
 try:
     api_key = st.secrets["GROQ_API_KEY"]  # For Streamlit Cloud
@@ -17,11 +21,6 @@ except Exception:
   # Local fallback
 model ="llama-3.3-70b-versatile"
 
-# Essay input
-st.title("📄 Essay Grader using LLMs")
-essay = st.text_area("Enter your essay here:", height=400)
-submit = st.button("Grade Essay")
-
 # Define the State type
 class State(TypedDict):
     essay: str
@@ -30,6 +29,19 @@ class State(TypedDict):
     structure_score: float
     depth_score: float
     final_score: float
+    # One message per dimension whose response had no readable score
+    parse_errors: list[str]
+
+def new_state(essay: str) -> State:
+    return State(
+        essay=essay,
+        relevance_score=0.0,
+        grammar_score=0.0,
+        structure_score=0.0,
+        depth_score=0.0,
+        final_score=0.0,
+        parse_errors=[]
+    )
 
 # Helper to extract numeric score from model response
 def extract_score(content: str) -> float:
@@ -38,64 +50,88 @@ def extract_score(content: str) -> float:
         return float(match.group(1))
     raise ValueError(f"Could not extract score from: {content}")
 
-# Initialize LLM
+# Shared LLM client (pooled keep-alive connections across nodes); temperature 0
+# so the cached scores are the model's answer, not one sample of it
 def get_llm():
-    return ChatGroq(model=model, api_key=api_key)
+    return get_chat_groq(model, api_key=api_key, temperature=0)
+
+# Scoring prompts, one per dimension
+RELEVANCE_PROMPT = ChatPromptTemplate.from_template(
+    "Analyze the relevance of the following essay to the given topic. "
+    "Provide a relevance score between 0 and 1. "
+    "Your response should start with 'Score: ' followed by the numeric score.\n\nEssay: {essay}"
+)
+GRAMMAR_PROMPT = ChatPromptTemplate.from_template(
+    "Analyze the grammar of the following essay. "
+    "Provide a grammar score between 0 and 1. "
+    "Your response should start with 'Score: ' followed by the numeric score.\n\nEssay: {essay}"
+)
+STRUCTURE_PROMPT = ChatPromptTemplate.from_template(
+    "Analyze the structure of the following essay. "
+    "Provide a structure score between 0 and 1. "
+    "Your response should start with 'Score: ' followed by the numeric score.\n\nEssay: {essay}"
+)
+DEPTH_PROMPT = ChatPromptTemplate.from_template(
+    "Evaluate the depth of analysis in the following essay. "
+    "Provide a depth score between 0 and 1. "
+    "Your response should start with 'Score: ' followed by the numeric score.\n\nEssay: {essay}"
+)
+
+# (state key, label, prompt) in grading order
+DIMENSIONS = [
+    ("relevance_score", "Relevance", RELEVANCE_PROMPT),
+    ("grammar_score", "Grammar", GRAMMAR_PROMPT),
+    ("structure_score", "Structure", STRUCTURE_PROMPT),
+    ("depth_score", "Depth", DEPTH_PROMPT),
+]
+
+# A dimension only counts if the one before it clears its threshold
+GATES = [
+    ("relevance_score", 0.5),
+    ("grammar_score", 0.6),
+    ("structure_score", 0.7),
+]
+
+def score_essay(prompt: ChatPromptTemplate, essay: str) -> float:
+    # Only responses with a readable score are cached
+    result = cached_invoke(get_llm(), prompt.format(essay=essay), validate=extract_score)
+    return extract_score(result.content)
+
+def record_parse_error(state: State, label: str, error: ValueError) -> None:
+    """Score the dimension 0.0 but keep the failure visible to callers"""
+    st.error(f"{label} Error: {error}")
+    state["parse_errors"] = state["parse_errors"] + [f"{label}: {error}"]
 
 # Component scoring functions
 def check_relevance(state: State) -> State:
-    prompt = ChatPromptTemplate.from_template(
-        "Analyze the relevance of the following essay to the given topic. "
-        "Provide a relevance score between 0 and 1. "
-        "Your response should start with 'Score: ' followed by the numeric score.\n\nEssay: {essay}"
-    )
-    result = get_llm().invoke(prompt.format(essay=state["essay"]))
     try:
-        state["relevance_score"] = extract_score(result.content)
+        state["relevance_score"] = score_essay(RELEVANCE_PROMPT, state["essay"])
     except ValueError as e:
-        st.error(f"Relevance Error: {e}")
+        record_parse_error(state, "Relevance", e)
         state["relevance_score"] = 0.0
     return state
 
 def check_grammar(state: State) -> State:
-    prompt = ChatPromptTemplate.from_template(
-        "Analyze the grammar of the following essay. "
-        "Provide a grammar score between 0 and 1. "
-        "Your response should start with 'Score: ' followed by the numeric score.\n\nEssay: {essay}"
-    )
-    result = get_llm().invoke(prompt.format(essay=state["essay"]))
     try:
-        state["grammar_score"] = extract_score(result.content)
+        state["grammar_score"] = score_essay(GRAMMAR_PROMPT, state["essay"])
     except ValueError as e:
-        st.error(f"Grammar Error: {e}")
+        record_parse_error(state, "Grammar", e)
         state["grammar_score"] = 0.0
     return state
 
 def analyze_structure(state: State) -> State:
-    prompt = ChatPromptTemplate.from_template(
-        "Analyze the structure of the following essay. "
-        "Provide a structure score between 0 and 1. "
-        "Your response should start with 'Score: ' followed by the numeric score.\n\nEssay: {essay}"
-    )
-    result = get_llm().invoke(prompt.format(essay=state["essay"]))
     try:
-        state["structure_score"] = extract_score(result.content)
+        state["structure_score"] = score_essay(STRUCTURE_PROMPT, state["essay"])
     except ValueError as e:
-        st.error(f"Structure Error: {e}")
+        record_parse_error(state, "Structure", e)
         state["structure_score"] = 0.0
     return state
 
 def evaluate_depth(state: State) -> State:
-    prompt = ChatPromptTemplate.from_template(
-        "Evaluate the depth of analysis in the following essay. "
-        "Provide a depth score between 0 and 1. "
-        "Your response should start with 'Score: ' followed by the numeric score.\n\nEssay: {essay}"
-    )
-    result = get_llm().invoke(prompt.format(essay=state["essay"]))
     try:
-        state["depth_score"] = extract_score(result.content)
+        state["depth_score"] = score_essay(DEPTH_PROMPT, state["essay"])
     except ValueError as e:
-        st.error(f"Depth Error: {e}")
+        record_parse_error(state, "Depth", e)
         state["depth_score"] = 0.0
     return state
 
@@ -116,9 +152,9 @@ workflow.add_node("analyze_structure", analyze_structure)
 workflow.add_node("evaluate_depth", evaluate_depth)
 workflow.add_node("calculate_final_score", calculate_final_score)
 
-workflow.add_conditional_edges("check_relevance", lambda x: "check_grammar" if x["relevance_score"] > 0.5 else "calculate_final_score")
-workflow.add_conditional_edges("check_grammar", lambda x: "analyze_structure" if x["grammar_score"] > 0.6 else "calculate_final_score")
-workflow.add_conditional_edges("analyze_structure", lambda x: "evaluate_depth" if x["structure_score"] > 0.7 else "calculate_final_score")
+workflow.add_conditional_edges("check_relevance", lambda x: "check_grammar" if x["relevance_score"] > GATES[0][1] else "calculate_final_score")
+workflow.add_conditional_edges("check_grammar", lambda x: "analyze_structure" if x["grammar_score"] > GATES[1][1] else "calculate_final_score")
+workflow.add_conditional_edges("analyze_structure", lambda x: "evaluate_depth" if x["structure_score"] > GATES[2][1] else "calculate_final_score")
 workflow.add_conditional_edges("evaluate_depth", lambda x: "calculate_final_score")
 
 workflow.set_entry_point("check_relevance")
@@ -126,31 +162,141 @@ workflow.add_edge("calculate_final_score", END)
 
 app = workflow.compile()
 
-# When user clicks "Grade Essay"
-if submit:
-    if not api_key:
-        st.warning("Please enter your GROQ API key in the sidebar.")
-    elif not essay.strip():
-        st.warning("Please enter an essay.")
-    else:
-        with st.spinner("Evaluating essay..."):
-            initial_state = State(
-                essay=essay,
-                relevance_score=0.0,
-                grammar_score=0.0,
-                structure_score=0.0,
-                depth_score=0.0,
-                final_score=0.0
-            )
-            result = app.invoke(initial_state)
-
-        st.success("✅ Essay evaluation complete!")
-
-        st.subheader("📊 Evaluation Scores")
-        st.write(f"**Relevance Score:** {result['relevance_score']:.2f}")
-        st.write(f"**Grammar Score:** {result['grammar_score']:.2f}")
-        st.write(f"**Structure Score:** {result['structure_score']:.2f}")
-        st.write(f"**Depth Score:** {result['depth_score']:.2f}")
-        st.markdown("---")
-        st.write(f"### 🏁 Final Score: `{result['final_score']:.2f}`")
+def apply_gates(state: State) -> State:
+    """Zero every dimension after the first failed gate, as the graph would skip them"""
+    thresholds = dict(GATES)
+    gate_failed = False
+    for key, _, _ in DIMENSIONS:
+        if gate_failed:
+            state[key] = 0.0
+        threshold = thresholds.get(key)
+        if threshold is not None and state[key] <= threshold:
+            gate_failed = True
+    return state
+
+def grade_essay_parallel(essay: str) -> State:
+    """Score all four dimensions concurrently, then gate and combine.
+
+    Latency is one LLM round-trip instead of up to four, at the cost of
+    also scoring dimensions the gates end up discarding.
+    """
+    state = new_state(essay)
+    with ThreadPoolExecutor(max_workers=len(DIMENSIONS)) as pool:
+        futures = [
+            (key, label, pool.submit(score_essay, prompt, essay))
+            for key, label, prompt in DIMENSIONS
+        ]
+        # Streamlit calls stay on the script thread
+        for key, label, future in futures:
+            try:
+                state[key] = future.result()
+            except ValueError as e:
+                record_parse_error(state, label, e)
+                state[key] = 0.0
+
+    return calculate_final_score(apply_gates(state))
+
+STRUCTURED_PROMPT = ChatPromptTemplate.from_template(
+    "Grade the following essay on four dimensions, each scored between 0 and 1:\n"
+    "- relevance: relevance of the essay to its topic\n"
+    "- grammar: grammatical correctness\n"
+    "- structure: organization and structure\n"
+    "- depth: depth of analysis\n"
+    "Respond with a single JSON object and nothing else, exactly in the form "
+    '{{"relevance": 0.0, "grammar": 0.0, "structure": 0.0, "depth": 0.0}}.\n\n'
+    "Essay: {essay}"
+)
+
+# JSON field -> state key for the structured response
+STRUCTURED_FIELDS = {
+    "relevance": "relevance_score",
+    "grammar": "grammar_score",
+    "structure": "structure_score",
+    "depth": "depth_score",
+}
+
+def parse_structured_scores(content: str) -> dict:
+    """Validate the single-call response; raises ValueError on anything unexpected"""
+    match = re.search(r'\{.*\}', content, re.DOTALL)
+    if not match:
+        raise ValueError(f"No JSON object in response: {content}")
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in response: {e}")
+    if not isinstance(data, dict) or set(data) != set(STRUCTURED_FIELDS):
+        raise ValueError(f"Expected keys {sorted(STRUCTURED_FIELDS)}, got: {data}")
+
+    scores = {}
+    for field, key in STRUCTURED_FIELDS.items():
+        value = data[field]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 1:
+            raise ValueError(f"{field} must be a number between 0 and 1, got: {value!r}")
+        scores[key] = float(value)
+    return scores
+
+def grade_essay_single_call(essay: str) -> State:
+    """Score all four dimensions from one structured response.
+
+    The essay is sent once instead of four times; if the response fails
+    validation, it is not cached and grading falls back to the
+    per-dimension prompts.
+    """
+    try:
+        result = cached_invoke(
+            get_llm(), STRUCTURED_PROMPT.format(essay=essay), validate=parse_structured_scores
+        )
+        scores = parse_structured_scores(result.content)
+    except ValueError as e:
+        st.warning(f"Structured scoring failed, using per-dimension prompts: {e}")
+        return grade_essay_parallel(essay)
+
+    state = new_state(essay)
+    state.update(scores)
+    return calculate_final_score(apply_gates(state))
+
+# Grading strategies offered in the UI and the batch runner
+GRADING_MODES = {
+    "single": grade_essay_single_call,
+    "parallel": grade_essay_parallel,
+    "sequential": lambda essay: app.invoke(new_state(essay)),
+}
+
+def main():
+    # Essay input
+    st.title("📄 Essay Grader using LLMs")
+    essay = st.text_area("Enter your essay here:", height=400)
+    mode = st.radio(
+        "Grading mode",
+        list(GRADING_MODES),
+        format_func={
+            "single": "Single call (all dimensions in one response)",
+            "parallel": "Parallel (one prompt per dimension, concurrently)",
+            "sequential": "Sequential (gated, one dimension at a time)",
+        }.get,
+        horizontal=True,
+    )
+    submit = st.button("Grade Essay")
+
+    # When user clicks "Grade Essay"
+    if submit:
+        if not api_key:
+            st.warning("Please enter your GROQ API key in the sidebar.")
+        elif not essay.strip():
+            st.warning("Please enter an essay.")
+        else:
+            with st.spinner("Evaluating essay..."):
+                result = GRADING_MODES[mode](essay)
+
+            st.success("✅ Essay evaluation complete!")
+
+            st.subheader("📊 Evaluation Scores")
+            st.write(f"**Relevance Score:** {result['relevance_score']:.2f}")
+            st.write(f"**Grammar Score:** {result['grammar_score']:.2f}")
+            st.write(f"**Structure Score:** {result['structure_score']:.2f}")
+            st.write(f"**Depth Score:** {result['depth_score']:.2f}")
+            st.markdown("---")
+            st.write(f"### 🏁 Final Score: `{result['final_score']:.2f}`")
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# hub/loader.py
+import sys
+import importlib.util
+from pathlib import Path
+
+# Common Streamlit app file names, in lookup order
+ENTRY_FILE_NAMES = ['main.py', 'app.py', 'streamlit_app.py']
+
+
+def find_agent_file(agent_config):
+    """Return the entry file for an agent config, or None if it has none.
+
+    An explicit `entry` file name is used as given; without one the common
+    names are tried in order.
+    """
+    folder_path = Path(agent_config['folder'])
+    if 'entry' in agent_config:
+        file_path = folder_path / agent_config['entry']
+        return file_path if file_path.is_file() else None
+
+    module_name = agent_config['module'].split('.')[-1]
+    for file_name in ENTRY_FILE_NAMES + [f'{module_name}.py']:
+        file_path = folder_path / file_name
+        if file_path.exists():
+            return file_path
+    return None
+
+
+def compile_agent_file(file_path):
+    """Read and compile an agent file without running it.
+
+    Compiling has no Streamlit side effects, so the result is safe to cache;
+    executing it is not.
+    """
+    file_path = Path(file_path).absolute()
+    source = file_path.read_text(encoding='utf-8')
+    return compile(source, str(file_path), 'exec')
+
+
+def load_module_from_file(module_name, file_path, code=None):
+    """Execute an agent file as a fresh module without leaving its folder on sys.path.
+
+    The agent folder is only on sys.path while the module body executes, so
+    sibling imports at module top level still resolve. Pass a precompiled
+    `code` object to skip reading and compiling the file again.
+    """
+    file_path = Path(file_path).absolute()
+    folder = str(file_path.parent)
+    added_to_path = folder not in sys.path
+    if added_to_path:
+        sys.path.insert(0, folder)
+
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            if code is None:
+                spec.loader.exec_module(module)
+            else:
+                exec(code, module.__dict__)
+        except Exception:
+            sys.modules.pop(module_name, None)
+            raise
+        return module
+    finally:
+        if added_to_path and folder in sys.path:
+            sys.path.remove(folder)
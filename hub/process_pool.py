@@ -0,0 +1,242 @@
+# hub/process_pool.py
+import os
+import sys
+import time
+import socket
+import atexit
+import threading
+import subprocess
+import urllib.request
+from pathlib import Path
+from dataclasses import dataclass, field
+
+HEALTH_PATH = "/_stcore/health"
+
+# Put on the children's PYTHONPATH so common/ imports without installing the project
+REPO_ROOT = str(Path(__file__).resolve().parent.parent)
+
+# Linux socket tables; "01" in the state column is ESTABLISHED
+PROC_NET_TCP = ("/proc/net/tcp", "/proc/net/tcp6")
+TCP_ESTABLISHED = "01"
+
+
+@dataclass
+class AgentProcess:
+    agent_key: str
+    file_path: str
+    port: int
+    process: subprocess.Popen
+    started_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.port}"
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+
+class AgentProcessPool:
+    """Supervisor for isolated `streamlit run` agent processes.
+
+    Each agent gets its own port, processes are reused while they stay
+    healthy, and processes idle for longer than `idle_ttl` seconds are reaped
+    by a background thread. A process counts as in use while a browser holds
+    a connection to its port: every open tab keeps a websocket to the
+    Streamlit server, so `last_used` follows the tabs, not the hub. Where
+    connections cannot be counted, `last_used` is the last launch. A process
+    with open tabs is never evicted to make room for another.
+    """
+
+    def __init__(self, base_port=8502, max_port=8599, max_processes=4,
+                 idle_ttl=600, startup_timeout=30.0, reap_interval=30.0):
+        self.base_port = base_port
+        self.max_port = max_port
+        self.max_processes = max_processes
+        self.idle_ttl = idle_ttl
+        self.startup_timeout = startup_timeout
+        self._processes = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+
+        self._reaper = threading.Thread(
+            target=self._reap_loop, args=(reap_interval,), daemon=True
+        )
+        self._reaper.start()
+        atexit.register(self.shutdown)
+
+    def launch(self, agent_key, file_path):
+        """Return a healthy process for the agent, starting one if needed"""
+        with self._lock:
+            proc = self._processes.get(agent_key)
+            if proc and (proc.file_path != str(file_path) or not proc.is_alive()):
+                self._stop_process(agent_key)
+                proc = None
+            if proc is None:
+                self._make_room()
+                proc = self._start_process(agent_key, str(file_path))
+                self._processes[agent_key] = proc
+
+        # A warm process answers the first health check immediately
+        if not self._wait_until_healthy(proc):
+            with self._lock:
+                if self._processes.get(agent_key) is proc:
+                    self._stop_process(agent_key)
+            raise RuntimeError(
+                f"{agent_key} did not become healthy on port {proc.port} "
+                f"within {self.startup_timeout:.0f}s"
+            )
+        proc.last_used = time.monotonic()
+        return proc
+
+    def prestart(self, agents):
+        """Warm up processes for (agent_key, file_path) pairs in background threads.
+
+        At most `max_processes` are started, so warming up never evicts
+        the first ones. Failures are left for a later launch() to report.
+        """
+        threads = [
+            threading.Thread(target=self._prestart_one, args=(key, path), daemon=True)
+            for key, path in list(agents)[:self.max_processes]
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def status(self):
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "agent": proc.agent_key,
+                    "port": proc.port,
+                    "pid": proc.process.pid,
+                    "alive": proc.is_alive(),
+                    "clients": _client_connections(proc.port),
+                    "idle_seconds": round(now - proc.last_used, 1),
+                }
+                for proc in self._processes.values()
+            ]
+
+    def reap_idle(self):
+        """Stop processes that died or have had no open tab for idle_ttl"""
+        now = time.monotonic()
+        with self._lock:
+            for agent_key, proc in list(self._processes.items()):
+                if not proc.is_alive():
+                    self._stop_process(agent_key)
+                    continue
+                if _client_connections(proc.port):
+                    proc.last_used = now
+                elif now - proc.last_used > self.idle_ttl:
+                    self._stop_process(agent_key)
+
+    def shutdown(self):
+        self._stop.set()
+        with self._lock:
+            for agent_key in list(self._processes):
+                self._stop_process(agent_key)
+
+    def _reap_loop(self, interval):
+        while not self._stop.wait(interval):
+            self.reap_idle()
+
+    def _prestart_one(self, agent_key, file_path):
+        try:
+            self.launch(agent_key, file_path)
+        except (RuntimeError, OSError):
+            pass
+
+    def _make_room(self):
+        self.reap_idle()
+        while len(self._processes) >= self.max_processes:
+            unused = [
+                proc for proc in self._processes.values()
+                if not _client_connections(proc.port)
+            ]
+            if not unused:
+                raise RuntimeError(
+                    f"All {self.max_processes} agent processes have open tabs; "
+                    "close one before starting another"
+                )
+            oldest = min(unused, key=lambda p: p.last_used)
+            self._stop_process(oldest.agent_key)
+
+    def _start_process(self, agent_key, file_path):
+        port = self._allocate_port()
+        cmd = [
+            sys.executable, "-m", "streamlit", "run", file_path,
+            "--server.port", str(port),
+            "--server.headless", "true",
+        ]
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [REPO_ROOT, env.get("PYTHONPATH")]))
+        process = subprocess.Popen(
+            cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        return AgentProcess(agent_key, file_path, port, process)
+
+    def _stop_process(self, agent_key):
+        proc = self._processes.pop(agent_key, None)
+        if proc is None or not proc.is_alive():
+            return
+        proc.process.terminate()
+        try:
+            proc.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.process.kill()
+
+    def _allocate_port(self):
+        used = {proc.port for proc in self._processes.values()}
+        for port in range(self.base_port, self.max_port + 1):
+            if port not in used and _port_is_free(port):
+                return port
+        raise RuntimeError(f"No free port between {self.base_port} and {self.max_port}")
+
+    def _is_healthy(self, proc):
+        if not proc.is_alive():
+            return False
+        try:
+            with urllib.request.urlopen(proc.url + HEALTH_PATH, timeout=1) as response:
+                return response.status == 200
+        except OSError:
+            return False
+
+    def _wait_until_healthy(self, proc):
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self._is_healthy(proc):
+                return True
+            if not proc.is_alive():
+                return False
+            time.sleep(0.2)
+        return False
+
+
+def _client_connections(port):
+    """Established TCP connections to a local port, or None if unknown"""
+    if not os.path.exists(PROC_NET_TCP[0]):
+        return None
+    count = 0
+    for table in PROC_NET_TCP:
+        try:
+            with open(table) as f:
+                next(f, None)
+                for line in f:
+                    fields = line.split()
+                    local, state = fields[1], fields[3]
+                    if state == TCP_ESTABLISHED and int(local.rsplit(":", 1)[1], 16) == port:
+                        count += 1
+        except OSError:
+            continue
+    return count
+
+
+def _port_is_free(port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind(("127.0.0.1", port))
+        except OSError:
+            return False
+        return True
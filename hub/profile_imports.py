@@ -0,0 +1,181 @@
+# hub/profile_imports.py
+"""Profile cold-start import cost of every agent registered in main.py.
+
+Each agent is imported in a fresh interpreter with `-X importtime`, so the
+numbers include every heavy dependency the agent pulls in at module level.
+
+    python -m hub.profile_imports --output import_report.json
+    python -m hub.profile_imports --baseline old_report.json
+"""
+import re
+import ast
+import sys
+import json
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+from hub.loader import find_agent_file
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HUB_FILE = REPO_ROOT / "main.py"
+RESULT_MARKER = "__IMPORT_PROFILE__"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# Runs inside the child interpreter; argv is [module_name, file_path]
+RUNNER = r'''
+import sys, json, time
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            import os
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        return None
+
+from hub.loader import load_module_from_file
+
+result = {"rss_before_kb": rss_kb(), "error": None}
+start = time.perf_counter()
+try:
+    load_module_from_file(sys.argv[1], sys.argv[2])
+except BaseException as e:
+    result["error"] = f"{type(e).__name__}: {e}"
+result["import_seconds"] = round(time.perf_counter() - start, 4)
+result["rss_after_kb"] = rss_kb()
+print("__IMPORT_PROFILE__" + json.dumps(result), flush=True)
+'''
+
+
+def load_agent_registry(hub_file=HUB_FILE):
+    """Read the AGENTS dict from main.py without executing the Streamlit app"""
+    tree = ast.parse(Path(hub_file).read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "AGENTS" for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"No AGENTS registry found in {hub_file}")
+
+
+def parse_importtime(stderr, top=15):
+    """Return the slowest modules by cumulative import time"""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            })
+    modules.sort(key=lambda m: m["cumulative_us"], reverse=True)
+    return len(modules), modules[:top]
+
+
+def profile_agent(agent_key, agent_config, timeout=300, top=15):
+    file_path = find_agent_file(
+        {**agent_config, "folder": str(REPO_ROOT / agent_config["folder"])}
+    )
+    if file_path is None:
+        expected = Path(agent_config["folder"]) / agent_config.get("entry", "main.py")
+        return {"status": "error", "file": None,
+                "error": f"No entry file for {agent_key}: {expected} does not exist"}
+
+    cmd = [
+        sys.executable, "-X", "importtime", "-c", RUNNER,
+        f"hub_agent_{agent_key}", str(file_path),
+    ]
+    try:
+        completed = subprocess.run(
+            cmd, cwd=REPO_ROOT, stdin=subprocess.DEVNULL,
+            capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout", "file": str(file_path.relative_to(REPO_ROOT))}
+
+    report = {"status": "ok", "file": str(file_path.relative_to(REPO_ROOT))}
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            report.update(json.loads(line[len(RESULT_MARKER):]))
+            break
+    else:
+        report["status"] = "crashed"
+        report["error"] = completed.stderr.strip().splitlines()[-1:] or None
+
+    if report.get("error"):
+        report["status"] = "error"
+    if report.get("rss_before_kb") is not None and report.get("rss_after_kb") is not None:
+        report["rss_delta_kb"] = report["rss_after_kb"] - report["rss_before_kb"]
+
+    report["module_count"], report["top_modules"] = parse_importtime(completed.stderr, top)
+    return report
+
+
+def compare_reports(current, baseline):
+    """Per-agent import time delta against a previous report"""
+    deltas = {}
+    for agent_key, entry in current["agents"].items():
+        old = baseline.get("agents", {}).get(agent_key, {})
+        if "import_seconds" in entry and "import_seconds" in old:
+            deltas[agent_key] = round(entry["import_seconds"] - old["import_seconds"], 4)
+    return deltas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="import_report.json")
+    parser.add_argument("--agents", help="Comma-separated agent keys (default: all)")
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to keep per agent")
+    parser.add_argument("--timeout", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    agents = load_agent_registry()
+    if args.agents:
+        wanted = set(args.agents.split(","))
+        agents = {key: config for key, config in agents.items() if key in wanted}
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "agents": {},
+    }
+    for agent_key, agent_config in agents.items():
+        entry = profile_agent(agent_key, agent_config, args.timeout, args.top)
+        report["agents"][agent_key] = entry
+        seconds = entry.get("import_seconds")
+        timing = f"{seconds:8.3f}s" if seconds is not None else "       -"
+        rss = entry.get("rss_delta_kb")
+        memory = f"{rss / 1024:8.1f} MB" if rss is not None else "         -"
+        print(f"{agent_key:20} {entry['status']:8} {timing} {memory}")
+        if entry["file"] is None:
+            print(f"  {entry['error']}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["baseline_deltas"] = compare_reports(report, json.load(f))
+        for agent_key, delta in report["baseline_deltas"].items():
+            print(f"{agent_key:20} {delta:+8.3f}s vs baseline")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+    unprofiled = [key for key, entry in report["agents"].items() if entry["file"] is None]
+    if unprofiled:
+        sys.exit(f"No entry file for: {', '.join(unprofiled)}")
+
+
+if __name__ == "__main__":
+    main()
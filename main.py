@@ -1,9 +1,8 @@
 import streamlit as st
 import importlib
-import sys
 import os
-from pathlib import Path
-import subprocess
+from hub.loader import ENTRY_FILE_NAMES, find_agent_file, compile_agent_file, load_module_from_file
+from hub.process_pool import AgentProcessPool
 
 # Configure page
 st.set_page_config(
@@ -89,147 +88,171 @@ AGENTS = {
         "icon": "💼",
         "description": "Get personalized career guidance and job recommendations",
         "module": "career_Assitant_agent.main",
-        "folder": "career_Assitant_agent"
+        "folder": "career_Assitant_agent",
+        "entry": "genai_career_assistant.py"
     },
     "crypto_mcp": {
         "name": "Crypto MCP Agent",
         "icon": "₿",
         "description": "Cryptocurrency market analysis and predictions",
         "module": "crypto_mcp_agent.main",
-        "folder": "crypto_mcp_agent"
+        "folder": "crypto_mcp_agent",
+        "entry": "client.py"
     },
     "data_analysis": {
         "name": "Data Analysis Agent",
         "icon": "📊",
         "description": "Advanced data analysis and visualization tools",
         "module": "Data_analysis_agent.main",
-        "folder": "Data_analysis_agent"
+        "folder": "Data_analysis_agent",
+        "entry": "excel_csv_analyzer.py"
     },
     "essay_grading": {
         "name": "Essay Grading",
         "icon": "📝",
         "description": "AI-powered essay evaluation and feedback",
         "module": "essay_grading_agent",
-        "folder": "."
+        "folder": "essay_grading_agent.py",
+        "entry": "essay_grader.py"
     },
     "meme_generator": {
         "name": "Meme Generator",
         "icon": "😂",
         "description": "Create hilarious memes with AI assistance",
         "module": "meme_generator.main",
-        "folder": "meme_generator"
+        "folder": "meme_generator",
+        "entry": "main.py"
     },
     "mental_wellbeing": {
         "name": "Mental Wellbeing",
         "icon": "🧘",
         "description": "Mental health support and wellness tracking",
         "module": "mental_wellbeing.main",
-        "folder": "mental_wellbeing"
+        "folder": "mental_wellbeing",
+        "entry": "main.py"
     },
     "movie_generator": {
         "name": "Movie Generator",
         "icon": "🎬",
         "description": "Generate movie plots and recommendations",
         "module": "movie_generator.main",
-        "folder": "movie_generator"
+        "folder": "movie_generator",
+        "entry": "main.py"
     },
     "multi_recruit": {
         "name": "Multi Recruit Agent",
         "icon": "👥",
         "description": "Advanced recruitment and candidate matching",
         "module": "multi_recruit_agent.main",
-        "folder": "multi_recruit_agent"
+        "folder": "multi_recruit_agent",
+        "entry": "main.py"
     },
     "music_agent": {
         "name": "Music Agent",
         "icon": "🎵",
         "description": "Music generation and recommendation system",
         "module": "music_Agent.main",
-        "folder": "music_Agent"
+        "folder": "music_Agent",
+        "entry": "main.py"
     },
     "qr_generator": {
         "name": "QR Code Generator",
         "icon": "📱",
         "description": "Generate custom QR codes with styling options",
         "module": "QR_code_generator.main",
-        "folder": "QR_code_generator"
+        "folder": "QR_code_generator",
+        "entry": "main.py"
     },
     "simple_agent": {
         "name": "Simple Agent",
         "icon": "🤖",
         "description": "Basic AI agent using AGNO framework",
         "module": "simple_agent_using_agno.main",
-        "folder": "simple_agent_using_agno"
+        "folder": "simple_agent_using_agno",
+        "entry": "agno_agent_streamli.py"
     },
     "system_design": {
         "name": "System Design",
         "icon": "🏗️",
         "description": "System architecture and design assistant",
         "module": "system_design.main",
-        "folder": "system_design"
+        "folder": "system_design",
+        "entry": "main.py"
     },
     "tic_tac_toe": {
         "name": "Tic Tac Toe",
         "icon": "⭕",
         "description": "Play Tic Tac Toe against AI",
         "module": "tic_tac_toe.main",
-        "folder": "tic_tac_toe"
+        "folder": "tic_tac_toe",
+        "entry": "main.py"
     },
     "travel_planner": {
         "name": "Travel Planner",
         "icon": "✈️",
         "description": "Plan and organize your perfect trip",
         "module": "travel_planner.main",
-        "folder": "travel_planner"
+        "folder": "travel_planner",
+        "entry": "main.py"
     },
     "voice_agent": {
         "name": "Voice Agent",
         "icon": "🎤",
         "description": "Voice-powered AI interactions",
         "module": "voice_agent.main",
-        "folder": "voice_agent"
+        "folder": "voice_agent",
+        "entry": "main.py"
     },
     "web_scraper": {
         "name": "Web Scraper",
         "icon": "🕷️",
         "description": "Extract data from websites efficiently",
         "module": "web_scraper_agent.main",
-        "folder": "web_scraper_agent"
+        "folder": "web_scraper_agent",
+        "entry": "main.py"
     },
     "web_search": {
         "name": "Web Search Summarizer",
         "icon": "🔍",
         "description": "Search and summarize web content",
         "module": "Web_search_summerizer.main",
-        "folder": "Web_search_summerizer"
+        "folder": "Web_search_summerizer",
+        "entry": "summerizer_streamlit.py"
     }
 }
 
+@st.cache_resource(show_spinner=False)
+def _cached_agent_file(agent_key):
+    """Entry file lookup, done once per process"""
+    return find_agent_file(AGENTS[agent_key])
+
+@st.cache_resource(show_spinner=False, max_entries=len(AGENTS))
+def _compiled_agent_code(file_path, mtime):
+    """Compiled agent source; a new mtime gives a new cache entry.
+
+    Only the code object is cached. The module body still runs on every
+    rerun, so per-session setup (st.session_state defaults, page config,
+    widgets) happens for each session exactly as before. Its heavy imports
+    stay in sys.modules after the first run and cost nothing afterwards.
+    """
+    return compile_agent_file(file_path)
+
+def get_agent_code(agent_key):
+    """(entry file, compiled code) for an agent, or (None, None) if it has no file"""
+    file_path = _cached_agent_file(agent_key)
+    if file_path is None:
+        return None, None
+    return file_path, _compiled_agent_code(str(file_path), file_path.stat().st_mtime_ns)
+
 def load_agent_module(agent_key):
-    """Dynamically load agent module"""
+    """Dynamically load agent module (source compiled once, body run per rerun)"""
     try:
         agent_config = AGENTS[agent_key]
-        folder_path = Path(agent_config['folder'])
-        
-        # Add agent folder to Python path if it exists
-        if folder_path.exists() and folder_path != Path('.'):
-            sys.path.insert(0, str(folder_path.absolute()))
-        
-        # Try to import the module
-        module_name = agent_config['module'].split('.')[-1]  # Get the last part
-        
-        # Look for common Streamlit app file names
-        possible_files = ['main.py', 'app.py', 'streamlit_app.py', f'{module_name}.py']
-        
-        for file_name in possible_files:
-            file_path = folder_path / file_name
-            if file_path.exists():
-                spec = importlib.util.spec_from_file_location(module_name, file_path)
-                module = importlib.util.module_from_spec(spec)
-                sys.modules[module_name] = module
-                spec.loader.exec_module(module)
-                return module
-                
+        file_path, code = get_agent_code(agent_key)
+
+        if file_path is not None:
+            return load_module_from_file(f"hub_agent_{agent_key}", file_path, code)
+
         # If no specific file found, try direct import
         return importlib.import_module(agent_config['module'])
         
@@ -237,31 +260,47 @@ def load_agent_module(agent_key):
         st.error(f"Error loading {agent_key}: {str(e)}")
         return None
 
+# Agents warmed up when the hub starts, so their first "Run Isolated" is instant
+PRESTART_AGENTS = [
+    key.strip() for key in os.getenv("HUB_PRESTART_AGENTS", "essay_grading,web_search,data_analysis").split(",")
+    if key.strip() in AGENTS
+]
+
+@st.cache_resource(show_spinner=False)
+def get_process_pool():
+    """One supervisor per hub process, shared by every session"""
+    pool = AgentProcessPool(base_port=8502, max_processes=4, idle_ttl=600)
+    warm = []
+    for agent_key in PRESTART_AGENTS:
+        file_path = find_agent_file(AGENTS[agent_key])
+        if file_path is not None:
+            warm.append((agent_key, file_path))
+    pool.prestart(warm)
+    return pool
+
 def run_agent_in_subprocess(agent_key):
     """Run agent as subprocess (alternative approach)"""
     try:
         agent_config = AGENTS[agent_key]
-        folder_path = Path(agent_config['folder'])
+        file_path = find_agent_file(agent_config)
         
-        # Look for the main file
-        possible_files = ['main.py', 'app.py', 'streamlit_app.py']
+        if file_path is None:
+            st.error(f"Could not find main file for {agent_config['name']}")
+            return
         
-        for file_name in possible_files:
-            file_path = folder_path / file_name
-            if file_path.exists():
-                # Run streamlit app in subprocess
-                cmd = f"streamlit run {file_path} --server.port 8502 --server.headless true"
-                process = subprocess.Popen(cmd, shell=True)
-                st.success(f"Started {agent_config['name']} on port 8502")
-                st.markdown(f"[Open {agent_config['name']}](http://localhost:8502)")
-                return
-                
-        st.error(f"Could not find main file for {agent_config['name']}")
+        # Reuses a warm process for this agent or starts one on a free port
+        with st.spinner(f"Starting {agent_config['name']}..."):
+            proc = get_process_pool().launch(agent_key, file_path)
+        st.success(f"{agent_config['name']} is running on port {proc.port}")
+        st.markdown(f"[Open {agent_config['name']}]({proc.url})")
         
     except Exception as e:
         st.error(f"Error running {agent_key}: {str(e)}")
 
 def main():
+    # Starts the supervisor and its warm-up on the hub's first run
+    get_process_pool()
+
     # Initialize session state
     if 'current_agent' not in st.session_state:
         st.session_state.current_agent = None
@@ -312,7 +351,7 @@ def main():
         agent_config = AGENTS[current_agent]
         
         # Back button
-        col1, col2 = st.columns([1, 4])
+        col1, col2, col3 = st.columns([1, 3, 1])
         with col1:
             if st.button("← Back to Hub", key="back_btn"):
                 st.session_state.current_agent = None
@@ -321,6 +360,10 @@ def main():
         with col2:
             st.title(f"{agent_config['icon']} {agent_config['name']}")
         
+        with col3:
+            if st.button("🚀 Run Isolated", key="isolated_btn", help="Run this agent in its own Streamlit process"):
+                run_agent_in_subprocess(current_agent)
+        
         st.markdown("---")
         
         # Try to load and run the agent
@@ -333,22 +376,13 @@ def main():
                 module.run()
             else:
                 # Method 2: Try to execute the file directly
-                agent_folder = Path(agent_config['folder'])
-                possible_files = ['main.py', 'app.py', 'streamlit_app.py']
-                
                 executed = False
-                for file_name in possible_files:
-                    file_path = agent_folder / file_name
-                    if file_path.exists():
-                        # Read and execute the file
-                        with open(file_path, 'r') as f:
-                            code = f.read()
-                        
-                        # Create a new namespace for execution
-                        exec_globals = {'__name__': '__main__', 'st': st}
-                        exec(code, exec_globals)
-                        executed = True
-                        break
+                file_path, code = get_agent_code(current_agent)
+                if file_path is not None and file_path.name in ENTRY_FILE_NAMES:
+                    # Create a new namespace for execution; the compiled code is cached
+                    exec_globals = {'__name__': '__main__', 'st': st}
+                    exec(code, exec_globals)
+                    executed = True
                 
                 if not executed:
                     st.error(f"Could not load {agent_config['name']}. Please check the file structure.")
@@ -362,7 +396,7 @@ def main():
         except Exception as e:
             st.error(f"Error running {agent_config['name']}: {str(e)}")
             st.info("You can also try running this agent independently:")
-            st.code(f"streamlit run {agent_config['folder']}/main.py")
+            st.code(f"streamlit run {agent_config['folder']}/{agent_config['entry']}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -9,13 +9,17 @@ import os
 import tempfile
 import hashlib
 from groq import Groq
-import numpy as np
 import random
 import re
 from typing import List, Tuple, Dict
 
 import os
 
+from common.lazy_imports import lazy_import
+from common.groq_clients import get_groq_client
+
+np = lazy_import("numpy")
+
 try:
     api_key = st.secrets["GROQ_API_KEY"]  # For Streamlit Cloud
 except Exception:
@@ -275,7 +279,7 @@ if 'final_meme' not in st.session_state:
 if 'selected_caption' not in st.session_state:
     st.session_state.selected_caption = ""
 if 'groq_client' not in st.session_state:
-    st.session_state.groq_client = None
+    st.session_state.groq_client = get_groq_client(api_key) if api_key else None
 if 'layout_type' not in st.session_state:
     st.session_state.layout_type = "single"
 if 'image_analysis' not in st.session_state:
@@ -3,15 +3,18 @@ import json
 import os
 from datetime import datetime, date, timedelta
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from groq import Groq
 import time
 import random
 from pathlib import Path
 import hashlib
 import os
 
+from common.lazy_imports import lazy_import
+from common.groq_clients import get_groq_client
+
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
+
 try:
     api_key = st.secrets["GROQ_API_KEY"]  # For Streamlit Cloud
 except Exception:
@@ -26,10 +29,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize Groq client (you'll need to add your API key)
+# Shared Groq client (pooled keep-alive connections across the hub)
 def init_groq_client():
-    # Replace with your actual Groq API key
-    return Groq(api_key=api_key)
+    return get_groq_client(api_key)
 
 # Data management functions
 def get_user_data_path(username):
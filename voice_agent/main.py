@@ -1,16 +1,13 @@
 import streamlit as st
-import speech_recognition as sr
 import threading
 import queue
 import time
 import tempfile
 import os
-from groq import Groq
 import json
 from datetime import datetime
 import io
 import wave
-import pyaudio
 import random
 import base64
 import requests
@@ -18,6 +15,12 @@ from urllib.parse import quote
 import streamlit.components.v1 as components
 import os
 
+from common.lazy_imports import lazy_import
+from common.groq_clients import get_groq_client
+
+# Microphone support loads on first use; sr.Microphone imports pyaudio itself
+sr = lazy_import("speech_recognition")
+
 try:
     api_key = st.secrets["GROQ_API_KEY"]  # For Streamlit Cloud
 except Exception:
@@ -162,7 +165,7 @@ if 'tts_service' not in st.session_state:
 
 class VoiceAgent:
     def __init__(self, api_key):
-        self.groq_client = Groq(api_key=api_key)
+        self.groq_client = get_groq_client(api_key)
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
         
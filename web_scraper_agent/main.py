@@ -10,6 +10,8 @@ from urllib.parse import urlparse, urljoin
 import time
 import os
 
+from common.groq_clients import GROQ_CHAT_URL, get_requests_session
+
 try:
     api_key = st.secrets["GROQ_API_KEY"]  # For Streamlit Cloud
 except Exception:
@@ -129,7 +131,7 @@ class WebSummarizerAgent:
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.groq_url = "https://api.groq.com/openai/v1/chat/completions"
+        self.groq_url = GROQ_CHAT_URL
     
     def search_web(self, query: str, max_results: int = 5) -> List[str]:
         """Search for URLs using DuckDuckGo (simplified version)"""
@@ -281,7 +283,7 @@ Format your response in clear markdown. Be thorough but concise, focusing on acc
                 "Content-Type": "application/json"
             }
             
-            response = requests.post(self.groq_url, headers=headers, json=payload, timeout=30)
+            response = get_requests_session().post(self.groq_url, headers=headers, json=payload, timeout=30)
             response.raise_for_status()
             
             result = response.json()